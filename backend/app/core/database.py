@@ -2,7 +2,9 @@
 Database configuration and session management with optimizations.
 """
 import time
+import random
 import logging
+import threading
 from typing import Generator
 from sqlalchemy import create_engine, text, event
 from sqlalchemy.orm import sessionmaker, Session
@@ -33,12 +35,25 @@ def create_optimized_engine():
         max_overflow=settings.database_max_overflow,
         pool_pre_ping=settings.database_pool_pre_ping,
         pool_recycle=settings.database_pool_recycle,
+        pool_timeout=settings.database_pool_timeout,
         echo=settings.database_echo,
-        
+
+        # SQL compilation cache: large enough that the app's full working
+        # set of statements stays cached instead of being recompiled
+        query_cache_size=1200,
+
         # Performance optimizations
         connect_args={
             "connect_timeout": 10,
             "application_name": "splitwise_backend",
+            # TCP keepalives so idle pooled connections are never
+            # silently dropped by the network (pre-ping is disabled)
+            "keepalives": 1,
+            "keepalives_idle": 30,
+            "keepalives_interval": 10,
+            "keepalives_count": 5,
+            # Kill runaway statements before they pin a pool connection
+            "options": "-c statement_timeout=30000",
         }
     )
     
@@ -78,11 +93,38 @@ def create_session_factory():
     return SessionLocal
 
 
+def prewarm_connection_pool():
+    """Open the full connection pool once so it is warmed at startup.
+
+    Connections are established eagerly and returned to the pool, so the
+    first burst of traffic does not pay the TCP+auth handshake per
+    connection.
+    """
+    if engine is None:
+        return
+
+    connections = []
+    try:
+        for _ in range(settings.database_pool_size):
+            connections.append(engine.connect())
+    except Exception as e:
+        logger.warning(f"Connection pool pre-warm stopped early: {e}")
+    finally:
+        for conn in connections:
+            conn.close()
+
+    logger.info(f"Pre-warmed {len(connections)} database connections")
+
+
 def init_database_with_retry() -> bool:
-    """Initialize database connection with retry logic."""
+    """Initialize database connection with retry logic.
+
+    Retries use exponential backoff with jitter so replicas restarting
+    together don't hammer the database in lockstep.
+    """
     max_retries = settings.db_max_retries
-    retry_delay = settings.db_retry_delay
-    
+    base_delay = settings.db_retry_delay
+
     for attempt in range(max_retries):
         try:
             logger.info(f"Attempting database connection (attempt {attempt + 1}/{max_retries})")
@@ -97,18 +139,62 @@ def init_database_with_retry() -> bool:
             
             logger.info(f"Database connection successful on attempt {attempt + 1}")
             
+            # Extensions must exist before create_all builds the trigram index
+            with engine.connect() as conn:
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                conn.commit()
+
             # Import and create tables
             from app.models import Base
             logger.info("Creating database tables...")
             Base.metadata.create_all(bind=engine)
             logger.info("Database tables created successfully")
-            
+
+            # Precomputed per-membership balances; the unique index lets the
+            # view be refreshed CONCURRENTLY without blocking readers
+            with engine.connect() as conn:
+                conn.execute(text("""
+                    CREATE MATERIALIZED VIEW IF NOT EXISTS user_group_balance AS
+                    SELECT
+                        ug.user_id,
+                        ug.group_id,
+                        COALESCE(p.paid, 0) AS paid_total,
+                        COALESCE(o.owed, 0) AS owes_total,
+                        COALESCE(p.paid, 0) - COALESCE(o.owed, 0) AS balance
+                    FROM user_groups ug
+                    LEFT JOIN (
+                        SELECT group_id, paid_by AS user_id, SUM(amount) AS paid
+                        FROM expenses GROUP BY group_id, paid_by
+                    ) p ON p.group_id = ug.group_id AND p.user_id = ug.user_id
+                    LEFT JOIN (
+                        SELECT e.group_id, s.user_id, SUM(s.amount) AS owed
+                        FROM expense_splits s JOIN expenses e ON e.id = s.expense_id
+                        GROUP BY e.group_id, s.user_id
+                    ) o ON o.group_id = ug.group_id AND o.user_id = ug.user_id
+                """))
+                conn.execute(text(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS idx_user_group_balance_pk "
+                    "ON user_group_balance (user_id, group_id)"
+                ))
+                # Re-derive the denormalized group totals so they stay
+                # honest across restarts and manual data edits
+                conn.execute(text(
+                    "UPDATE groups SET total_expenses = COALESCE("
+                    "(SELECT SUM(amount) FROM expenses "
+                    "WHERE expenses.group_id = groups.id), 0)"
+                ))
+                conn.commit()
+
+            # Warm the pool so steady-state requests never open connections
+            prewarm_connection_pool()
+
             return True
             
         except Exception as e:
             logger.warning(f"Database connection failed (attempt {attempt + 1}/{max_retries}): {e}")
             if attempt < max_retries - 1:
-                logger.info(f"Retrying in {retry_delay} seconds...")
+                retry_delay = min(30, base_delay * (2 ** attempt)) * random.uniform(0.5, 1.5)
+                logger.info(f"Retrying in {retry_delay:.1f} seconds...")
                 time.sleep(retry_delay)
             else:
                 logger.error(f"Failed to connect to database after {max_retries} attempts")
@@ -117,6 +203,24 @@ def init_database_with_retry() -> bool:
     return False
 
 
+def init_database_in_background() -> threading.Thread:
+    """Run the database retry loop without blocking startup.
+
+    The retry loop can wait minutes against a database that is still
+    coming up; running it in a daemon thread lets the server accept
+    connections (and answer /health) immediately. Until initialization
+    finishes, get_database_session raises and get_db turns that into a
+    fast 503.
+    """
+    thread = threading.Thread(
+        target=init_database_with_retry,
+        name="db-init",
+        daemon=True
+    )
+    thread.start()
+    return thread
+
+
 def get_database_session() -> Generator[Session, None, None]:
     """
     Dependency to get database session with proper resource management.
@@ -138,8 +242,33 @@ def get_database_session() -> Generator[Session, None, None]:
         session.close()
 
 
+# Reusable probe statement and deep-check throttle: readiness probes fire
+# every few seconds per replica, so only hit Postgres every 30s and answer
+# from pool state in between
+_PROBE = text("SELECT 1 as health_check")
+_DEEP_CHECK_INTERVAL = 30.0
+_last_deep_check = 0.0
+# Serializes the deep probe so a burst of probes when the interval
+# lapses doesn't stampede the pool with concurrent SELECT 1s
+_deep_check_lock = threading.Lock()
+
+
+def _get_pool_status() -> dict:
+    """Get current connection pool statistics."""
+    pool = engine.pool
+    return {
+        "pool_size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow()
+        # Note: 'invalid' method was removed in newer SQLAlchemy versions
+    }
+
+
 def get_database_health() -> dict:
     """Check database health and return status information."""
+    global _last_deep_check
+
     try:
         if engine is None:
             return {
@@ -147,28 +276,31 @@ def get_database_health() -> dict:
                 "database": "not_initialized",
                 "message": "Database engine not created"
             }
-        
-        # Test database connection
-        with engine.connect() as conn:
-            result = conn.execute(text("SELECT 1 as health_check"))
-            result.fetchone()
-        
-        # Get pool information
-        pool = engine.pool
-        pool_status = {
-            "pool_size": pool.size(),
-            "checked_in": pool.checkedin(),
-            "checked_out": pool.checkedout(),
-            "overflow": pool.overflow()
-            # Note: 'invalid' method was removed in newer SQLAlchemy versions
-        }
-        
+
+        # Shallow check between deep probes: pool state only, no round trip
+        now = time.monotonic()
+        if now - _last_deep_check < _DEEP_CHECK_INTERVAL:
+            return {
+                "status": "healthy",
+                "database": "connected",
+                "pool_status": _get_pool_status()
+            }
+
+        # Deep check: actually touch the database. One prober at a time;
+        # anyone who lost the race re-checks the timestamp and answers
+        # shallow instead of issuing a second probe.
+        with _deep_check_lock:
+            if now - _last_deep_check >= _DEEP_CHECK_INTERVAL:
+                with engine.connect() as conn:
+                    conn.execute(_PROBE).fetchone()
+                _last_deep_check = time.monotonic()
+
         return {
             "status": "healthy",
             "database": "connected",
-            "pool_status": pool_status
+            "pool_status": _get_pool_status()
         }
-        
+
     except Exception as e:
         logger.error(f"Database health check failed: {e}")
         return {
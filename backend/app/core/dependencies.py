@@ -4,6 +4,7 @@ Dependency injection and utility functions.
 import logging
 from typing import Generator, Optional
 from fastapi import HTTPException, Depends
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 from app.core.database import get_database_session, get_database_health
 from app.core.config import settings
@@ -24,18 +25,22 @@ def get_db() -> Generator[Session, None, None]:
     try:
         db_session = next(get_database_session())
         yield db_session
+    except HTTPException:
+        # Domain errors raised by services pass through the yield;
+        # re-raise untouched so they keep their status codes
+        raise
+    except SQLAlchemyError:
+        # Let the registered SQLAlchemyError handler produce the 500
+        raise
     except RuntimeError as e:
         logger.error(f"Database dependency error: {e}")
         raise HTTPException(
             status_code=503,
             detail="Database service unavailable"
         )
-    except Exception as e:
-        logger.error(f"Unexpected database error: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail="Internal server error"
-        )
+    # Anything else (validation errors, bugs) propagates so FastAPI's
+    # own handlers - the 422 validation handler, the global 500 handler
+    # in main.py - can specialize the response
 
 
 def get_settings():
@@ -83,6 +88,18 @@ class CacheManager:
             del self._cache[key]
         if key in self._ttl:
             del self._ttl[key]
+
+    def increment(self, key: str) -> int:
+        """Increment a persistent integer counter (used for versioned keys)."""
+        value = int(self._cache.get(key, 0)) + 1
+        self._cache[key] = value
+        return value
+
+    def delete_prefix(self, prefix: str) -> None:
+        """Delete all cached values whose key starts with the prefix."""
+        for key in [k for k in self._cache if k.startswith(prefix)]:
+            self._cache.pop(key, None)
+            self._ttl.pop(key, None)
     
     def clear(self) -> None:
         """Clear all cached values."""
@@ -5,12 +5,15 @@ import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
+from sqlalchemy.exc import SQLAlchemyError
+from anyio import to_thread
 import time
 
 from app.core.config import settings
-from app.core.database import init_database_with_retry, close_database_connections
+from app.core.database import init_database_in_background, close_database_connections
 from app.utils.logging import setup_logging
 from app.utils.performance import performance_monitor, db_monitor
 
@@ -36,15 +39,20 @@ async def lifespan(app: FastAPI):
     logger.info(f"📋 Configuration: {settings.api_title} v{settings.api_version}")
     logger.info(f"🔧 Debug mode: {settings.debug}")
     logger.info(f"🤖 AI Chatbot: {'enabled' if settings.deepseek_api_key else 'disabled (fallback mode)'}")
-    
-    # Initialize database
-    logger.info("🗄️ Initializing database connection...")
-    db_success = init_database_with_retry()
-    if not db_success:
-        logger.error("❌ Failed to initialize database. Some features may not work.")
-    else:
-        logger.info("✅ Database initialized successfully")
-    
+
+    # Sync endpoints run on the anyio threadpool, which defaults to 40
+    # workers; raise it so concurrency is capped by the configured limit
+    # (and ultimately the DB pool) rather than the threadpool default
+    limiter = to_thread.current_default_thread_limiter()
+    limiter.total_tokens = settings.max_concurrent_requests
+    logger.info(f"🧵 Thread pool capacity set to {settings.max_concurrent_requests}")
+
+    # Initialize database in the background: the retry loop can wait a
+    # long time for a database that is still starting, and /health should
+    # answer in the meantime. DB-backed requests 503 until it finishes.
+    logger.info("🗄️ Initializing database connection in background...")
+    init_database_in_background()
+
     logger.info("🎯 API startup complete!")
     
     yield
@@ -62,6 +70,9 @@ app = FastAPI(
     description=settings.api_description,
     debug=settings.debug,
     lifespan=lifespan,
+    # orjson serializes large model lists several times faster than the
+    # stdlib json used by the default JSONResponse
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json"
@@ -73,6 +84,10 @@ app.add_middleware(
     allowed_hosts=["*"] if settings.debug else ["localhost", "127.0.0.1"]
 )
 
+# Compress text-heavy responses (chatbot answers, list endpoints).
+# Small payloads skip compression; level 4 keeps the CPU cost low.
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=4)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -117,6 +132,22 @@ async def performance_middleware(request: Request, call_next):
     return response
 
 
+# Database error handler - services no longer wrap repository calls, so
+# database failures surface here as SQLAlchemyError
+@app.exception_handler(SQLAlchemyError)
+async def database_exception_handler(request: Request, exc: SQLAlchemyError):
+    """Handle database errors with a consistent response."""
+    logger.error(f"Database error on {request.method} {request.url.path}: {exc}", exc_info=True)
+
+    return JSONResponse(
+        status_code=500,
+        content={
+            "error": "Database Error",
+            "detail": "A database error occurred. Please try again later."
+        }
+    )
+
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -240,11 +271,16 @@ if __name__ == "__main__":
     import uvicorn
     
     logger.info("🚀 Starting Splitwise API server...")
+    # uvicorn[standard] ships uvloop and httptools and uvicorn picks
+    # them automatically. Stays single-process: the in-memory cache and
+    # its version-counter invalidation are per-process, so scaling out
+    # is done with replicas, not workers. The access log costs a
+    # logging call per request and is only kept for debugging.
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
         reload=settings.debug,
         log_level=settings.log_level.lower(),
-        access_log=True
+        access_log=settings.debug
     )
@@ -28,7 +28,21 @@ class SplitType(enum.Enum):
 
 class User(Base):
     __tablename__ = "users"
-    
+    __table_args__ = (
+        # Trigram index so ILIKE '%term%' name search uses an index probe
+        # instead of a sequential scan (requires the pg_trgm extension,
+        # created at startup)
+        Index(
+            'idx_users_name_trgm',
+            'name',
+            postgresql_using='gin',
+            postgresql_ops={'name': 'gin_trgm_ops'}
+        ),
+    )
+    # Fetch server defaults (created_at) with the INSERT's RETURNING
+    # clause instead of a refresh round trip
+    __mapper_args__ = {"eager_defaults": True}
+
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, index=True)  # Index for search
     email = Column(String, unique=True, index=True, nullable=False)
@@ -58,15 +72,19 @@ class User(Base):
 
 class Group(Base):
     __tablename__ = "groups"
-    
+    __mapper_args__ = {"eager_defaults": True}
+
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, index=True)  # Index for search
+    # Denormalized running total maintained by expense writes (backfilled
+    # at startup), so group reads never sum expense rows
+    total_expenses = Column(Float, nullable=False, default=0.0, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
-    
+
     # Relationships with optimized lazy loading
     users = relationship(
-        "User", 
-        secondary=user_group_association, 
+        "User",
+        secondary=user_group_association,
         back_populates="groups",
         lazy="select"
     )
@@ -83,7 +101,8 @@ class Group(Base):
 
 class Expense(Base):
     __tablename__ = "expenses"
-    
+    __mapper_args__ = {"eager_defaults": True}
+
     id = Column(Integer, primary_key=True, index=True)
     description = Column(String, nullable=False)
     amount = Column(Float, nullable=False, index=True)  # Index for sorting by amount
@@ -107,6 +126,14 @@ class Expense(Base):
         Index('idx_expenses_group_created', 'group_id', 'created_at'),
         Index('idx_expenses_paid_by_group', 'paid_by', 'group_id'),
         Index('idx_expenses_group_amount', 'group_id', 'amount'),
+        # Serves the paid-per-user aggregation: filter on group_id,
+        # group by paid_by; carrying amount enables index-only SUM scans
+        Index(
+            'idx_expenses_group_paid_by',
+            'group_id',
+            'paid_by',
+            postgresql_include=['amount']
+        ),
     )
     
     def __repr__(self):
@@ -126,10 +153,21 @@ class ExpenseSplit(Base):
     expense = relationship("Expense", back_populates="splits")
     user = relationship("User", back_populates="expense_splits")
     
-    # Composite indexes for balance calculations
+    # Composite indexes for balance calculations; INCLUDE (amount) lets
+    # the owed-per-user SUMs run as index-only scans without heap fetches
     __table_args__ = (
-        Index('idx_expense_splits_user_expense', 'user_id', 'expense_id'),
-        Index('idx_expense_splits_expense_user', 'expense_id', 'user_id'),
+        Index(
+            'idx_expense_splits_user_expense',
+            'user_id',
+            'expense_id',
+            postgresql_include=['amount']
+        ),
+        Index(
+            'idx_expense_splits_expense_user',
+            'expense_id',
+            'user_id',
+            postgresql_include=['amount']
+        ),
     )
     
     def __repr__(self):
@@ -2,12 +2,24 @@
 Balance repository with optimized balance calculations.
 """
 from typing import List, Dict, Any, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
-from app.models.database import User, Group, Expense, ExpenseSplit
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, func, text
+from app.models.database import User, Group, Expense, ExpenseSplit, user_group_association
+from app.core import database
 from app.core.dependencies import cache_manager
 from app.core.config import settings
 
+# The user_group_balance materialized view is created at startup. Writes
+# mark it stale via invalidate_balance_cache; the next read refreshes it
+# once, so repeated dashboard loads hit precomputed rows.
+_REFRESH_BALANCE_VIEW = text("REFRESH MATERIALIZED VIEW CONCURRENTLY user_group_balance")
+_BALANCE_VIEW_USER_ROWS = text(
+    "SELECT g.id, g.name, b.paid_total, b.owes_total "
+    "FROM user_group_balance b JOIN groups g ON g.id = b.group_id "
+    "WHERE b.user_id = :user_id ORDER BY g.name"
+)
+_balance_view_stale = True
+
 
 class BalanceRepository:
     """Repository for balance calculations with caching and optimizations."""
@@ -18,6 +30,19 @@ class BalanceRepository:
     def _get_cache_key(self, prefix: str, *args) -> str:
         """Generate cache key for balance calculations."""
         return f"{prefix}:{'_'.join(map(str, args))}"
+
+    def _refresh_balance_view_if_stale(self):
+        """Refresh the balance materialized view after data changes.
+
+        CONCURRENTLY cannot run inside a transaction, so the refresh uses
+        its own autocommit connection; readers are never blocked.
+        """
+        global _balance_view_stale
+        if not _balance_view_stale or database.engine is None:
+            return
+        with database.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(_REFRESH_BALANCE_VIEW)
+        _balance_view_stale = False
     
     def get_user_balance_in_group(self, db: Session, user_id: int, group_id: int) -> Dict[str, Any]:
         """Get balance for a specific user in a specific group."""
@@ -64,22 +89,65 @@ class BalanceRepository:
         if cached:
             return cached
         
-        # Get all users in the group
+        # Get all users in the group in the same query
         group = (
             db.query(Group)
+            .options(selectinload(Group.users))
             .filter(Group.id == group_id)
             .first()
         )
-        
+
         if not group:
             return []
-        
+
+        # One aggregate query for the whole group: paid and owed subqueries
+        # FULL OUTER JOINed on user, coalesced in SQL
+        paid_sq = (
+            db.query(
+                Expense.paid_by.label("user_id"),
+                func.sum(Expense.amount).label("paid")
+            )
+            .filter(Expense.group_id == group_id)
+            .group_by(Expense.paid_by)
+            .subquery()
+        )
+        owed_sq = (
+            db.query(
+                ExpenseSplit.user_id.label("user_id"),
+                func.sum(ExpenseSplit.amount).label("owed")
+            )
+            .join(Expense)
+            .filter(Expense.group_id == group_id)
+            .group_by(ExpenseSplit.user_id)
+            .subquery()
+        )
+
+        totals = {
+            row.user_id: (float(row.paid), float(row.owed))
+            for row in (
+                db.query(
+                    func.coalesce(paid_sq.c.user_id, owed_sq.c.user_id).label("user_id"),
+                    func.coalesce(paid_sq.c.paid, 0).label("paid"),
+                    func.coalesce(owed_sq.c.owed, 0).label("owed")
+                )
+                .select_from(paid_sq)
+                .join(owed_sq, paid_sq.c.user_id == owed_sq.c.user_id, full=True)
+                .all()
+            )
+        }
+
         balances = []
         for user in group.users:
-            balance_data = self.get_user_balance_in_group(db, user.id, group_id)
-            balance_data["user_name"] = user.name
-            balances.append(balance_data)
-        
+            paid_amount, owed_amount = totals.get(user.id, (0.0, 0.0))
+            balances.append({
+                "user_id": user.id,
+                "group_id": group_id,
+                "balance": paid_amount - owed_amount,
+                "paid_total": paid_amount,
+                "owes_total": owed_amount,
+                "user_name": user.name
+            })
+
         # Sort by balance (highest debt first, then highest credit)
         balances.sort(key=lambda x: x["balance"])
         
@@ -95,29 +163,104 @@ class BalanceRepository:
         if cached:
             return cached
         
-        # Get all groups for the user
-        user = (
-            db.query(User)
-            .filter(User.id == user_id)
-            .first()
-        )
-        
-        if not user:
-            return []
-        
-        balances = []
-        for group in user.groups:
-            balance_data = self.get_user_balance_in_group(db, user_id, group.id)
-            balance_data["group_name"] = group.name
-            balances.append(balance_data)
-        
-        # Sort by group name
-        balances.sort(key=lambda x: x["group_name"])
-        
+        # Indexed lookup against the precomputed materialized view; the
+        # refresh only runs when a write has marked the view stale
+        self._refresh_balance_view_if_stale()
+
+        rows = db.execute(_BALANCE_VIEW_USER_ROWS, {"user_id": user_id}).all()
+
+        balances = [
+            {
+                "user_id": user_id,
+                "group_id": row.id,
+                "balance": float(row.paid_total) - float(row.owes_total),
+                "paid_total": float(row.paid_total),
+                "owes_total": float(row.owes_total),
+                "group_name": row.name
+            }
+            for row in rows
+        ]
+
         # Cache for 1 minute
         self.cache.set(cache_key, balances, ttl=settings.balance_cache_ttl)
         return balances
     
+    def get_all_balance_totals(self, db: Session) -> Dict[tuple, tuple]:
+        """Get paid/owed totals for every (group, user) pair.
+
+        Two GROUP BY aggregates cover the whole dataset, replacing the
+        per-group per-user queries that context builders would otherwise
+        issue. Returns {(group_id, user_id): (paid, owed)}.
+        """
+        totals: Dict[tuple, list] = {}
+
+        paid_rows = (
+            db.query(
+                Expense.group_id,
+                Expense.paid_by,
+                func.sum(Expense.amount)
+            )
+            .group_by(Expense.group_id, Expense.paid_by)
+            .all()
+        )
+        for group_id, user_id, paid in paid_rows:
+            totals[(group_id, user_id)] = [float(paid), 0.0]
+
+        owed_rows = (
+            db.query(
+                Expense.group_id,
+                ExpenseSplit.user_id,
+                func.sum(ExpenseSplit.amount)
+            )
+            .select_from(ExpenseSplit)
+            .join(Expense)
+            .group_by(Expense.group_id, ExpenseSplit.user_id)
+            .all()
+        )
+        for group_id, user_id, owed in owed_rows:
+            entry = totals.setdefault((group_id, user_id), [0.0, 0.0])
+            entry[1] = float(owed)
+
+        return {key: tuple(value) for key, value in totals.items()}
+
+    def user_has_outstanding_balance(self, db: Session, user_id: int, threshold: float = 0.01) -> bool:
+        """Check whether a user owes or is owed more than the threshold anywhere.
+
+        Runs entirely in SQL so even users in very large groups are checked
+        without materializing per-group balances in Python.
+        """
+        paid = (
+            db.query(
+                Expense.group_id.label("group_id"),
+                func.sum(Expense.amount).label("paid")
+            )
+            .filter(Expense.paid_by == user_id)
+            .group_by(Expense.group_id)
+            .cte("paid")
+        )
+        owed = (
+            db.query(
+                Expense.group_id.label("group_id"),
+                func.sum(ExpenseSplit.amount).label("owed")
+            )
+            .select_from(ExpenseSplit)
+            .join(Expense)
+            .filter(ExpenseSplit.user_id == user_id)
+            .group_by(Expense.group_id)
+            .cte("owed")
+        )
+
+        balance = func.coalesce(paid.c.paid, 0) - func.coalesce(owed.c.owed, 0)
+        row = (
+            db.query(user_group_association.c.group_id)
+            .outerjoin(paid, paid.c.group_id == user_group_association.c.group_id)
+            .outerjoin(owed, owed.c.group_id == user_group_association.c.group_id)
+            .filter(user_group_association.c.user_id == user_id)
+            .filter(func.abs(balance) > threshold)
+            .first()
+        )
+        return row is not None
+
     def get_balance_summary(self, db: Session, user_id: Optional[int] = None) -> Dict[str, Any]:
         """Get balance summary for a user or overall system."""
         cache_key = self._get_cache_key("balance_summary", user_id or "system")
@@ -167,15 +310,24 @@ class BalanceRepository:
     
     def invalidate_balance_cache(self, user_id: Optional[int] = None, group_id: Optional[int] = None):
         """Invalidate balance caches when data changes."""
+        global _balance_view_stale
+        _balance_view_stale = True
+
+        # Bump the context version so chatbot context built on old data
+        # is never served again (cache-aside: old entries just expire)
+        self.cache.increment("chatbot_ctx_version")
+
         if user_id and group_id:
             # Invalidate specific user-group balance
             cache_key = self._get_cache_key("user_group_balance", user_id, group_id)
             self.cache.delete(cache_key)
         
         if group_id:
-            # Invalidate group balances
+            # Invalidate group balances and derived settlement suggestions
             cache_key = self._get_cache_key("group_balances", group_id)
             self.cache.delete(cache_key)
+            cache_key = self._get_cache_key("settlement_suggestions", group_id)
+            self.cache.delete(cache_key)
         
         if user_id:
             # Invalidate user all balances
@@ -192,8 +344,16 @@ class BalanceRepository:
     
     def get_settlement_suggestions(self, db: Session, group_id: int) -> List[Dict[str, Any]]:
         """Get suggestions for settling balances in a group."""
-        balances = self.get_group_balances(db, group_id)
-        
+        cache_key = self._get_cache_key("settlement_suggestions", group_id)
+        cached = self.cache.get(cache_key)
+
+        if cached:
+            return cached
+
+        # Copy the balance dicts: the settlement algorithm mutates them and
+        # must not corrupt the cached group balances
+        balances = [dict(b) for b in self.get_group_balances(db, group_id)]
+
         # Separate debtors and creditors
         debtors = [b for b in balances if b["balance"] < 0]
         creditors = [b for b in balances if b["balance"] > 0]
@@ -229,5 +389,7 @@ class BalanceRepository:
                 i += 1
             if abs(creditors[j]["balance"]) < 0.01:
                 j += 1
-        
+
+        # Cache for 1 minute (invalidated with the group balances)
+        self.cache.set(cache_key, suggestions, ttl=settings.balance_cache_ttl)
         return suggestions
@@ -16,8 +16,12 @@ class BaseRepository(Generic[ModelType]):
         self.model = model
     
     def get(self, db: Session, id: Any) -> Optional[ModelType]:
-        """Get a single record by ID."""
-        return db.query(self.model).filter(self.model.id == id).first()
+        """Get a single record by ID.
+
+        Uses Session.get so repeated lookups within a request hit the
+        identity map instead of re-querying the database.
+        """
+        return db.get(self.model, id)
     
     def get_multi(
         self, 
@@ -49,34 +53,46 @@ class BaseRepository(Generic[ModelType]):
         
         return query.offset(skip).limit(limit).all()
     
-    def create(self, db: Session, *, obj_in: Dict[str, Any]) -> ModelType:
-        """Create a new record."""
+    def create(self, db: Session, *, obj_in: Dict[str, Any], commit: bool = True) -> ModelType:
+        """Create a new record.
+
+        With commit=False the record is only flushed, letting callers batch
+        several writes into one transaction and commit once at the end.
+        """
         db_obj = self.model(**obj_in)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        if commit:
+            # eager_defaults on the models pulls server defaults back with
+            # the INSERT, and expire_on_commit=False keeps attributes
+            # valid, so no refresh round trip is needed
+            db.commit()
+        else:
+            db.flush()
         return db_obj
-    
+
     def update(
-        self, 
-        db: Session, 
-        *, 
-        db_obj: ModelType, 
-        obj_in: Dict[str, Any]
+        self,
+        db: Session,
+        *,
+        db_obj: ModelType,
+        obj_in: Dict[str, Any],
+        commit: bool = True
     ) -> ModelType:
-        """Update an existing record."""
+        """Update an existing record (flush only when commit=False)."""
         for field, value in obj_in.items():
             if hasattr(db_obj, field):
                 setattr(db_obj, field, value)
-        
+
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        if commit:
+            db.commit()
+        else:
+            db.flush()
         return db_obj
-    
+
     def remove(self, db: Session, *, id: Any) -> Optional[ModelType]:
         """Remove a record by ID."""
-        obj = db.query(self.model).get(id)
+        obj = db.get(self.model, id)
         if obj:
             db.delete(obj)
             db.commit()
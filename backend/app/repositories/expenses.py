@@ -2,7 +2,7 @@
 Expense repository with optimized database operations.
 """
 from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload
 from sqlalchemy import and_, func, desc, asc
 from datetime import datetime, timedelta
 from app.models.database import Expense, ExpenseSplit, User, Group
@@ -28,6 +28,42 @@ class ExpenseRepository(BaseRepository):
             .first()
         )
     
+    def get_expense_rows(self, db: Session, expense_id: int) -> List[Any]:
+        """Get an expense and its splits as flat rows from a single JOIN.
+
+        Returns one row per split carrying the expense columns, the payer
+        name and the split user name, so responses can be built without
+        instantiating any ORM entities.
+        """
+        payer = aliased(User)
+        return (
+            db.query(
+                Expense.id,
+                Expense.description,
+                Expense.amount,
+                Expense.group_id,
+                Expense.paid_by,
+                payer.name.label("paid_by_name"),
+                Expense.split_type,
+                Expense.created_at,
+                ExpenseSplit.user_id.label("split_user_id"),
+                User.name.label("split_user_name"),
+                ExpenseSplit.amount.label("split_amount"),
+                ExpenseSplit.percentage.label("split_percentage")
+            )
+            .join(payer, Expense.paid_by == payer.id)
+            .outerjoin(ExpenseSplit, ExpenseSplit.expense_id == Expense.id)
+            .outerjoin(User, ExpenseSplit.user_id == User.id)
+            .filter(Expense.id == expense_id)
+            .all()
+        )
+
+    def group_has_expenses(self, db: Session, group_id: int) -> bool:
+        """Check whether a group has any expenses (cheap EXISTS probe)."""
+        return db.query(
+            db.query(Expense.id).filter(Expense.group_id == group_id).exists()
+        ).scalar()
+
     def get_group_expenses(
         self, 
         db: Session, 
@@ -57,6 +93,39 @@ class ExpenseRepository(BaseRepository):
         
         return query.offset(skip).limit(limit).all()
     
+    def get_group_expense_rows(
+        self,
+        db: Session,
+        group_id: int,
+        skip: int = 0,
+        limit: int = 50,
+        order_by: str = "created_at",
+        desc_order: bool = True
+    ) -> List[Any]:
+        """Get expense summary rows for a group without hydrating ORM objects."""
+        query = (
+            db.query(
+                Expense.id,
+                Expense.description,
+                Expense.amount,
+                User.name.label("paid_by_name"),
+                Expense.split_type,
+                Expense.created_at
+            )
+            .join(User, Expense.paid_by == User.id)
+            .filter(Expense.group_id == group_id)
+        )
+
+        # Apply ordering
+        if hasattr(Expense, order_by):
+            order_field = getattr(Expense, order_by)
+            if desc_order:
+                query = query.order_by(desc(order_field))
+            else:
+                query = query.order_by(asc(order_field))
+
+        return query.offset(skip).limit(limit).all()
+
     def get_user_expenses(
         self, 
         db: Session, 
@@ -68,6 +137,7 @@ class ExpenseRepository(BaseRepository):
         return (
             db.query(Expense)
             .options(
+                joinedload(Expense.paid_by_user),
                 joinedload(Expense.group),
                 selectinload(Expense.splits).joinedload(ExpenseSplit.user)
             )
@@ -99,6 +169,45 @@ class ExpenseRepository(BaseRepository):
             .all()
         )
     
+    def get_recent_expense_rows_per_group(
+        self,
+        db: Session,
+        per_group: int = 10
+    ) -> List[Any]:
+        """Get the most recent expense rows for every group in one query.
+
+        A ROW_NUMBER window partitioned by group replaces one ordered
+        query per group; rows carry the payer name so no User lookups
+        are needed afterwards.
+        """
+        ranked = (
+            db.query(
+                Expense.id,
+                Expense.description,
+                Expense.amount,
+                Expense.group_id,
+                Expense.paid_by,
+                User.name.label("paid_by_name"),
+                Expense.split_type,
+                Expense.created_at,
+                func.row_number()
+                .over(
+                    partition_by=Expense.group_id,
+                    order_by=desc(Expense.created_at)
+                )
+                .label("rank")
+            )
+            .join(User, Expense.paid_by == User.id)
+            .subquery()
+        )
+
+        return (
+            db.query(ranked)
+            .filter(ranked.c.rank <= per_group)
+            .order_by(ranked.c.group_id, ranked.c.rank)
+            .all()
+        )
+
     def get_expenses_by_amount_range(
         self, 
         db: Session, 
@@ -131,20 +240,22 @@ class ExpenseRepository(BaseRepository):
         if group_id:
             query = query.filter(Expense.group_id == group_id)
         
+        # Zero-defaults are coalesced in SQL so rows come back non-null
+        # and no per-field patching is needed here
         stats = query.with_entities(
             func.count(Expense.id).label('total_expenses'),
-            func.sum(Expense.amount).label('total_amount'),
-            func.avg(Expense.amount).label('avg_amount'),
-            func.min(Expense.amount).label('min_amount'),
-            func.max(Expense.amount).label('max_amount')
+            func.coalesce(func.sum(Expense.amount), 0.0).label('total_amount'),
+            func.coalesce(func.avg(Expense.amount), 0.0).label('avg_amount'),
+            func.coalesce(func.min(Expense.amount), 0.0).label('min_amount'),
+            func.coalesce(func.max(Expense.amount), 0.0).label('max_amount')
         ).first()
-        
+
         return {
-            "total_expenses": stats.total_expenses or 0,
-            "total_amount": float(stats.total_amount or 0),
-            "average_amount": float(stats.avg_amount or 0),
-            "minimum_amount": float(stats.min_amount or 0),
-            "maximum_amount": float(stats.max_amount or 0)
+            "total_expenses": stats.total_expenses,
+            "total_amount": float(stats.total_amount),
+            "average_amount": float(stats.avg_amount),
+            "minimum_amount": float(stats.min_amount),
+            "maximum_amount": float(stats.max_amount)
         }
     
     def create_expense_with_splits(
@@ -159,19 +270,23 @@ class ExpenseRepository(BaseRepository):
             expense = Expense(**expense_data)
             db.add(expense)
             db.flush()  # Get the expense ID
-            
-            # Create splits
-            for split_data in splits_data:
-                split = ExpenseSplit(
-                    expense_id=expense.id,
-                    **split_data
-                )
-                db.add(split)
-            
+
+            # Batch-insert splits in a single statement
+            db.bulk_insert_mappings(
+                ExpenseSplit,
+                [{"expense_id": expense.id, **split_data} for split_data in splits_data]
+            )
+
+            # Keep the denormalized group total in the same transaction
+            db.query(Group).filter(Group.id == expense_data["group_id"]).update(
+                {Group.total_expenses: Group.total_expenses + expense_data["amount"]},
+                synchronize_session=False
+            )
+
             db.commit()
-            db.refresh(expense)
-            
-            # Load related data
+
+            # eager_defaults already populated server defaults on the
+            # INSERT; go straight to the eager-loaded read
             return self.get_with_splits(db, expense.id)
             
         except Exception as e:
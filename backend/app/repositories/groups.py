@@ -18,7 +18,7 @@ class GroupRepository(BaseRepository):
         """Get group with users (optimized with eager loading)."""
         return (
             db.query(Group)
-            .options(joinedload(Group.users))
+            .options(selectinload(Group.users))
             .filter(Group.id == group_id)
             .first()
         )
@@ -28,7 +28,7 @@ class GroupRepository(BaseRepository):
         return (
             db.query(Group)
             .options(
-                joinedload(Group.users),
+                selectinload(Group.users),
                 selectinload(Group.expenses).joinedload(Expense.paid_by_user),
                 selectinload(Group.expenses).joinedload(Expense.splits)
             )
@@ -41,7 +41,7 @@ class GroupRepository(BaseRepository):
         return (
             db.query(Group)
             .options(
-                joinedload(Group.users),
+                selectinload(Group.users),
                 selectinload(Group.expenses).joinedload(Expense.paid_by_user),
                 selectinload(Group.expenses).joinedload(Expense.splits).joinedload(ExpenseSplit.user)
             )
@@ -49,6 +49,35 @@ class GroupRepository(BaseRepository):
             .first()
         )
     
+    def adjust_total_expenses(
+        self,
+        db: Session,
+        group_id: int,
+        delta: float,
+        commit: bool = True
+    ) -> None:
+        """Apply a delta to the denormalized group expense total.
+
+        The increment runs SQL-side so concurrent writers don't lose
+        updates; with commit=False it joins the caller's transaction.
+        """
+        db.query(Group).filter(Group.id == group_id).update(
+            {Group.total_expenses: Group.total_expenses + delta},
+            synchronize_session=False
+        )
+        if commit:
+            db.commit()
+
+    def get_multi_with_users(self, db: Session, limit: int = 1000) -> List[Group]:
+        """Get groups with members eagerly loaded (one selectin batch)."""
+        return (
+            db.query(Group)
+            .options(selectinload(Group.users))
+            .order_by(Group.id)
+            .limit(limit)
+            .all()
+        )
+
     def get_groups_for_user(self, db: Session, user_id: int) -> List[Group]:
         """Get all groups for a specific user."""
         return (
@@ -63,33 +92,27 @@ class GroupRepository(BaseRepository):
         """Get group summary with calculated totals."""
         group = (
             db.query(Group)
-            .options(joinedload(Group.users))
+            .options(selectinload(Group.users))
             .filter(Group.id == group_id)
             .first()
         )
         
         if not group:
             return None
-        
-        # Calculate total expenses
-        total_expenses = (
-            db.query(func.sum(Expense.amount))
-            .filter(Expense.group_id == group_id)
-            .scalar() or 0
-        )
-        
-        # Count expenses
+
+        # The running total lives on the group row; only the count needs
+        # an aggregate
         expense_count = (
             db.query(func.count(Expense.id))
             .filter(Expense.group_id == group_id)
-            .scalar() or 0
+            .scalar()
         )
-        
+
         return {
             "id": group.id,
             "name": group.name,
             "member_count": len(group.users),
-            "total_expenses": float(total_expenses),
+            "total_expenses": float(group.total_expenses or 0),
             "expense_count": expense_count,
             "created_at": group.created_at
         }
@@ -108,7 +131,7 @@ class GroupRepository(BaseRepository):
         """Get recently created groups."""
         return (
             db.query(Group)
-            .options(joinedload(Group.users))
+            .options(selectinload(Group.users))
             .order_by(desc(Group.created_at))
             .limit(limit)
             .all()
@@ -127,20 +150,16 @@ class GroupRepository(BaseRepository):
         """Get groups with their balance summaries."""
         groups = (
             db.query(Group)
-            .options(joinedload(Group.users))
+            .options(selectinload(Group.users))
             .offset(skip)
             .limit(limit)
             .all()
         )
-        
+
         result = []
         for group in groups:
-            total_expenses = (
-                db.query(func.sum(Expense.amount))
-                .filter(Expense.group_id == group.id)
-                .scalar() or 0
-            )
-            
+            total_expenses = group.total_expenses or 0
+
             result.append({
                 "id": group.id,
                 "name": group.name,
@@ -2,9 +2,9 @@
 User repository with optimized database operations.
 """
 from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, func
-from app.models.database import User, Group, Expense
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import and_, func, select
+from app.models.database import User, Group, Expense, user_group_association
 from app.repositories.base import BaseRepository
 
 
@@ -18,11 +18,41 @@ class UserRepository(BaseRepository):
         """Get user by email address."""
         return db.query(User).filter(User.email == email).first()
     
+    def get_user_rows(
+        self,
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None
+    ) -> List[Any]:
+        """Get user listing rows with only the response columns.
+
+        Returns plain Core row tuples instead of ORM objects: no identity
+        map or instance-state bookkeeping per row, so listing stays cheap
+        as the users table grows. With after_id the listing switches to
+        keyset pagination (id-ordered), which stays O(limit) at any page
+        depth where OFFSET degrades linearly.
+        """
+        stmt = select(User.id, User.name, User.email, User.created_at)
+        if after_id is not None:
+            stmt = stmt.where(User.id > after_id).order_by(User.id)
+        else:
+            stmt = stmt.order_by(User.name).offset(skip)
+        return db.execute(stmt.limit(limit)).all()
+
+    def get_existing_emails(self, db: Session, emails: List[str]) -> set:
+        """Get the subset of the given emails that already exist."""
+        if not emails:
+            return set()
+        return set(
+            db.execute(select(User.email).where(User.email.in_(emails))).scalars()
+        )
+
     def get_with_groups(self, db: Session, user_id: int) -> Optional[User]:
         """Get user with their groups (optimized with eager loading)."""
         return (
             db.query(User)
-            .options(joinedload(User.groups))
+            .options(selectinload(User.groups))
             .filter(User.id == user_id)
             .first()
         )
@@ -32,7 +62,7 @@ class UserRepository(BaseRepository):
         return (
             db.query(User)
             .options(
-                joinedload(User.groups),
+                selectinload(User.groups),
                 joinedload(User.paid_expenses),
                 joinedload(User.expense_splits)
             )
@@ -60,6 +90,17 @@ class UserRepository(BaseRepository):
             .all()
         )
     
+    def get_user_ids_in_group(self, db: Session, group_id: int) -> List[int]:
+        """Get only the user IDs in a group (no ORM hydration)."""
+        return [
+            row[0]
+            for row in (
+                db.query(user_group_association.c.user_id)
+                .filter(user_group_association.c.group_id == group_id)
+                .all()
+            )
+        ]
+
     def get_active_users(self, db: Session, days: int = 30) -> List[User]:
         """Get users who have activity in the last N days."""
         from datetime import datetime, timedelta
@@ -2,16 +2,17 @@
 Chatbot API routes.
 """
 from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from app.core.dependencies import get_db
 from app.services.chatbot import ChatbotService
-from app.schemas.chatbot import ChatbotQuery, ChatbotResponse
+from app.schemas.chatbot import ChatbotQuery
 
 router = APIRouter(prefix="/chatbot", tags=["chatbot"])
 chatbot_service = ChatbotService()
 
 
-@router.post("/", response_model=ChatbotResponse, summary="Process chatbot query")
+@router.post("/", summary="Process chatbot query")
 def process_chatbot_query(
     query_data: ChatbotQuery,
     db: Session = Depends(get_db)
@@ -49,11 +50,28 @@ def process_chatbot_query(
     The chatbot uses AI when available (with DeepSeek API key) or falls back to rule-based responses.
     Responses are cached for better performance.
     """
-    result = chatbot_service.process_query(db, query_data.query, query_data.user_context)
-    
-    return ChatbotResponse(
-        response=result["response"],
-        context_used=result["context_used"],
-        cached=result["cached"],
-        response_time_ms=result["response_time_ms"]
+    # The service already returns the response-shaped dict; serializing
+    # it directly skips jsonable_encoder and response-model revalidation
+    return ORJSONResponse(
+        chatbot_service.process_query(db, query_data.query, query_data.user_context)
+    )
+
+
+@router.post("/stream", summary="Stream chatbot response")
+def stream_chatbot_query(
+    query_data: ChatbotQuery,
+    db: Session = Depends(get_db)
+):
+    """
+    Stream the chatbot answer as server-sent events.
+
+    Tokens are forwarded as they arrive from the AI backend, so the first
+    words show up in hundreds of milliseconds instead of after the full
+    response has been generated. Each event carries a JSON payload
+    `{"content": "..."}`; the stream ends with `[DONE]`.
+    """
+    return StreamingResponse(
+        chatbot_service.stream_query(db, query_data.query),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
     )
@@ -1,6 +1,7 @@
 """
 Health check and system status routes.
 """
+import time
 from fastapi import APIRouter, Depends
 from app.core.dependencies import health_check_dependency, get_cache_manager
 from app.core.config import settings
@@ -8,28 +9,44 @@ from app.schemas.common import HealthResponse
 
 router = APIRouter(tags=["health"])
 
+# Root endpoint payload never changes at runtime; build it once
+_ROOT_RESPONSE = {
+    "message": "Splitwise API is running!",
+    "status": "healthy",
+    "version": settings.api_version
+}
+
+# Per-second liveness probes should not each touch the pool: remember the
+# last response for a short window
+_HEALTH_TTL = 1.0
+_last_health: tuple = (0.0, None)  # (monotonic timestamp, HealthResponse)
+
 
 @router.get("/", summary="Root endpoint")
 def root():
     """Root endpoint showing API status."""
-    return {
-        "message": "Splitwise API is running!",
-        "status": "healthy",
-        "version": settings.api_version
-    }
+    return _ROOT_RESPONSE
 
 
 @router.get("/health", response_model=HealthResponse, summary="Health check")
-def health_check(health_data: dict = Depends(health_check_dependency)):
+def health_check():
     """
     Comprehensive health check endpoint.
-    
+
     Returns:
     - Database connection status
     - Connection pool information
     - API status
     """
-    return HealthResponse(**health_data)
+    global _last_health
+    now = time.monotonic()
+    checked_at, cached = _last_health
+    if cached is not None and now - checked_at < _HEALTH_TTL:
+        return cached
+
+    response = HealthResponse(**health_check_dependency())
+    _last_health = (now, response)
+    return response
 
 
 @router.get("/info", summary="System information")
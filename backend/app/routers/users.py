@@ -2,7 +2,8 @@
 User-related API routes.
 """
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from app.core.dependencies import get_db
 from app.services.users import UserService
@@ -28,21 +29,38 @@ def create_user(
     return user_service.create_user(db, user_data)
 
 
+@router.post("/bulk", response_model=List[UserResponse], summary="Create multiple users")
+def create_users_bulk(
+    users_data: List[UserCreate],
+    db: Session = Depends(get_db)
+):
+    """
+    Create multiple users in one request (e.g. CSV imports).
+
+    Duplicate emails - already registered or repeated in the payload -
+    are skipped; the response contains only the users that were created.
+    """
+    return user_service.create_users_bulk(db, users_data)
+
+
 @router.get("/", response_model=List[UserResponse], summary="Get all users")
 def get_users(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
     search: Optional[str] = Query(None, description="Search users by name"),
+    after_id: Optional[int] = Query(None, ge=0, description="Return users with an ID greater than this (cursor pagination)"),
     db: Session = Depends(get_db)
 ):
     """
     Retrieve all users with optional pagination and search.
-    
+
     - **skip**: Number of records to skip for pagination
     - **limit**: Maximum number of records to return (1-1000)
     - **search**: Optional search term to filter users by name
+    - **after_id**: Cursor for deep pagination; pass the last ID of the
+      previous page. Results are ID-ordered and skip/offset is ignored.
     """
-    return user_service.get_users(db, skip=skip, limit=limit, search=search)
+    return user_service.get_users(db, skip=skip, limit=limit, search=search, after_id=after_id)
 
 
 @router.get("/{user_id}", response_model=UserResponse, summary="Get user by ID")
@@ -88,20 +106,44 @@ def delete_user(
     return MessageResponse(message=result["message"])
 
 
-@router.get("/{user_id}/balances", response_model=List[UserBalanceResponse], summary="Get user balances")
+@router.get(
+    "/{user_id}/balances",
+    summary="Get user balances",
+    # Documented shape only; the handler serializes plain dicts directly
+    responses={200: {"model": List[UserBalanceResponse]}},
+)
 def get_user_balances(
     user_id: int,
     db: Session = Depends(get_db)
 ):
     """
     Get user's balances across all groups.
-    
+
     - **user_id**: The ID of the user
-    
+
     Returns balance information for each group the user belongs to.
     Positive balance means the user is owed money, negative means they owe money.
     """
-    return user_service.get_user_balances(db, user_id)
+    # Balance rows come from the repository as response-shaped dicts;
+    # serializing them directly skips jsonable_encoder and revalidation
+    return ORJSONResponse(user_service.get_user_balances(db, user_id))
+
+
+@router.get("/{user_id}/dashboard", summary="Get user dashboard")
+def get_user_dashboard(
+    user_id: int,
+    response: Response,
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Get everything a dashboard page needs in one request.
+
+    Replaces separate calls to the user, balances and summary endpoints,
+    so one HTTP round trip and one database session cover a page load.
+    Responses may be reused by the client for a few seconds.
+    """
+    response.headers["Cache-Control"] = "private, max-age=10"
+    return user_service.get_user_summary(db, user_id)
 
 
 @router.get("/{user_id}/summary", summary="Get user summary")
@@ -1,7 +1,7 @@
 """
 Balance-related Pydantic schemas for request/response validation.
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional
 
 
@@ -13,8 +13,7 @@ class BalanceResponse(BaseModel):
     paid_total: float
     owes_total: float
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserBalanceResponse(BaseModel):
@@ -25,8 +24,7 @@ class UserBalanceResponse(BaseModel):
     paid_total: float
     owes_total: float
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class BalanceSummary(BaseModel):
@@ -37,5 +35,4 @@ class BalanceSummary(BaseModel):
     largest_debt: float
     largest_credit: float
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -1,7 +1,7 @@
 """
 Chatbot-related Pydantic schemas for request/response validation.
 """
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, ConfigDict, field_validator
 from typing import Dict, Any, Optional
 
 
@@ -27,5 +27,4 @@ class ChatbotResponse(BaseModel):
     cached: bool = False
     response_time_ms: Optional[float] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
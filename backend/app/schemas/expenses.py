@@ -1,7 +1,8 @@
 """
 Expense-related Pydantic schemas for request/response validation.
 """
-from pydantic import BaseModel, field_validator
+import math
+from pydantic import BaseModel, ConfigDict, field_validator, model_validator
 from typing import List, Optional, Literal
 from datetime import datetime
 from decimal import Decimal
@@ -11,7 +12,7 @@ class ExpenseSplitInput(BaseModel):
     """Schema for expense split input in percentage-based splits."""
     user_id: int
     percentage: float
-    
+
     @field_validator('percentage')
     @classmethod
     def validate_percentage(cls, v):
@@ -46,28 +47,29 @@ class ExpenseCreate(ExpenseBase):
     split_type: Literal["equal", "percentage"]
     splits: Optional[List[ExpenseSplitInput]] = None
     
-    @field_validator('splits')
-    @classmethod
-    def validate_splits(cls, v, values):
-        if 'split_type' in values and values['split_type'] == 'percentage':
-            if not v:
+    @model_validator(mode='after')
+    def validate_splits(self):
+        # Runs once after field validation, so split_type is guaranteed to
+        # be set (the old field_validator depended on field order)
+        if self.split_type == 'percentage':
+            if not self.splits:
                 raise ValueError('Splits must be provided for percentage split type')
-            
-            # Check that percentages sum to 100
-            total_percentage = sum(split.percentage for split in v)
+
+            # fsum avoids float accumulation error on the percentage check
+            total_percentage = math.fsum(split.percentage for split in self.splits)
             if abs(total_percentage - 100) > 0.01:
                 raise ValueError(f'Percentages must sum to 100, got {total_percentage}')
-            
+
             # Check for duplicate user IDs
-            user_ids = [split.user_id for split in v]
+            user_ids = [split.user_id for split in self.splits]
             if len(set(user_ids)) != len(user_ids):
                 raise ValueError('Duplicate user IDs in splits')
-        
-        elif 'split_type' in values and values['split_type'] == 'equal':
-            if v is not None:
+
+        elif self.split_type == 'equal':
+            if self.splits is not None:
                 raise ValueError('Splits should not be provided for equal split type')
-        
-        return v
+
+        return self
 
 
 class ExpenseUpdate(BaseModel):
@@ -101,8 +103,7 @@ class ExpenseSplitResponse(BaseModel):
     amount: float
     percentage: Optional[float] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ExpenseResponse(ExpenseBase):
@@ -115,8 +116,7 @@ class ExpenseResponse(ExpenseBase):
     splits: List[ExpenseSplitResponse]
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ExpenseSummary(BaseModel):
@@ -128,5 +128,4 @@ class ExpenseSummary(BaseModel):
     split_type: str
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -1,7 +1,7 @@
 """
 Group-related Pydantic schemas for request/response validation.
 """
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, ConfigDict, field_validator
 from typing import List, Optional
 from datetime import datetime
 from .users import UserResponse, UserSummary
@@ -73,8 +73,7 @@ class GroupResponse(GroupBase):
     total_expenses: float
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class GroupSummary(BaseModel):
@@ -84,5 +83,4 @@ class GroupSummary(BaseModel):
     member_count: int
     total_expenses: float
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
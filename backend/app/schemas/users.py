@@ -1,7 +1,7 @@
 """
 User-related Pydantic schemas for request/response validation.
 """
-from pydantic import BaseModel, EmailStr, field_validator
+from pydantic import BaseModel, ConfigDict, EmailStr, field_validator
 from typing import List, Optional
 from datetime import datetime
 
@@ -48,8 +48,7 @@ class UserResponse(UserBase):
     id: int
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserSummary(BaseModel):
@@ -57,5 +56,4 @@ class UserSummary(BaseModel):
     id: int
     name: str
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
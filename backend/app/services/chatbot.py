@@ -1,20 +1,87 @@
 """
 Chatbot service with AI integration and caching.
 """
+import hashlib
 import logging
+import re
 import time
-import json
+
+import orjson
 from typing import Dict, Any, Optional
 from sqlalchemy.orm import Session
 from app.repositories.groups import GroupRepository
 from app.repositories.users import UserRepository
 from app.repositories.expenses import ExpenseRepository
+from app.repositories.balances import BalanceRepository
 from app.core.dependencies import cache_manager
 from app.core.config import settings
 import openai
 
 logger = logging.getLogger(__name__)
 
+# Settings are fixed for the process lifetime, so the API-key flag and
+# the fixed-shape context_used dict are built once at import
+_HAS_API_KEY = bool(settings.deepseek_api_key)
+_CTX_USED_TEMPLATE = {
+    "users_count": 0,
+    "groups_count": 0,
+    "has_api_key": _HAS_API_KEY,
+    "query_length": 0
+}
+
+# Invariant part of the system prompt. Kept first and byte-identical
+# across calls so provider-side prompt-prefix caching can reuse it; only
+# the context section after it varies.
+_SYSTEM_INSTRUCTIONS = """
+You are a helpful assistant for a Splitwise expense-splitting application.
+
+Answer user queries about expenses, balances, groups, and users based on the context data at the end of this prompt.
+
+FORMATTING GUIDELINES:
+- Use **bold** for important amounts and names
+- Use bullet points (•) for lists
+- Use tables when showing multiple balances or expenses
+- Use headings (##) to organize sections
+- Format monetary amounts as **$XX.XX**
+- Use user names instead of IDs when possible
+
+BALANCE INTERPRETATION:
+- Positive balance: person is owed money (they should receive)
+- Negative balance: person owes money (they should pay)
+- Zero balance: person is settled up
+
+Provide specific numbers and details when available. Be conversational and helpful.
+If data is not available, clearly mention what's missing.
+
+Current capabilities:
+- Check balances for users in groups
+- Find recent expenses and who paid
+- Show group summaries and member information
+- Calculate totals and provide expense breakdowns
+"""
+
+# Fallback response skeleton, built once at import time. The hot path
+# only fills the placeholders instead of re-assembling the markdown
+# from a dozen f-string fragments per request.
+_DEFAULT_RESPONSE_TEMPLATE = """## 🤖 Splitwise Assistant
+
+I found **{user_count} users** and **{group_count} groups** in your data.
+
+You asked: *"{query}"*
+
+### 📊 Quick Overview:
+• **Users**: {user_names}
+• **Groups**: {group_names}
+
+### 💡 Try asking:
+• **"How much does {example_user} owe in {example_group}?"**
+• **"Show me recent expenses"**
+• **"Who paid the most in {example_group}?"**
+• **"List all groups"**
+• **"What are {example_user}'s balances?"**
+
+What would you like to know? 😊"""
+
 
 class ChatbotService:
     """Service class for AI chatbot functionality."""
@@ -23,15 +90,25 @@ class ChatbotService:
         self.group_repo = GroupRepository()
         self.user_repo = UserRepository()
         self.expense_repo = ExpenseRepository()
+        self.balance_repo = BalanceRepository()
         self.cache = cache_manager
-    
+
+    def _context_version(self) -> int:
+        """Current context version; bumped by write endpoints."""
+        return int(self.cache.get("chatbot_ctx_version") or 0)
+
     def process_query(self, db: Session, query: str, user_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Process chatbot query with caching and AI integration."""
         start_time = time.time()
         
         try:
-            # Check cache first
-            cache_key = f"chatbot:{hash(query)}"
+            # Exact-match cache: normalized query salted with the context
+            # version, so "Show balances" and "show balances " share an
+            # entry but a data change never serves a stale answer
+            digest = hashlib.sha256(
+                f"{query.strip().lower()}:{self._context_version()}".encode()
+            ).hexdigest()[:32]
+            cache_key = f"chatbot:{digest}"
             cached_response = self.cache.get(cache_key)
             
             if cached_response:
@@ -41,19 +118,20 @@ class ChatbotService:
             
             # Get comprehensive context
             context = self._get_chatbot_context(db)
-            logger.info(f"Context loaded: {len(context.get('users', []))} users, {len(context.get('groups', []))} groups")
+            logger.debug("Context loaded: %d users, %d groups",
+                         len(context.get("users", [])), len(context.get("groups", [])))
             
             # Generate response
             response_text = self._generate_response(query, context)
             
+            context_used = _CTX_USED_TEMPLATE.copy()
+            context_used["users_count"] = len(context.get("users", []))
+            context_used["groups_count"] = len(context.get("groups", []))
+            context_used["query_length"] = len(query)
+
             response_data = {
                 "response": response_text,
-                "context_used": {
-                    "users_count": len(context.get("users", [])),
-                    "groups_count": len(context.get("groups", [])),
-                    "has_api_key": bool(settings.deepseek_api_key),
-                    "query_length": len(query)
-                },
+                "context_used": context_used,
                 "cached": False,
                 "response_time_ms": (time.time() - start_time) * 1000
             }
@@ -61,11 +139,12 @@ class ChatbotService:
             # Cache response
             self.cache.set(cache_key, response_data, ttl=settings.chatbot_response_cache_ttl)
             
-            logger.info(f"Response generated for query: '{query[:50]}...' - Time: {response_data['response_time_ms']:.2f}ms")
+            logger.info("Response generated for query: '%.50s...' - Time: %.2fms",
+                        query, response_data["response_time_ms"])
             return response_data
             
         except Exception as e:
-            logger.error(f"Chatbot error for query '{query}': {e}")
+            logger.error("Chatbot error for query '%s': %s", query, e)
             return {
                 "response": "Sorry, I encountered an error processing your request. Please try again later.",
                 "context_used": {"error": str(e)},
@@ -74,59 +153,70 @@ class ChatbotService:
             }
     
     def _get_chatbot_context(self, db: Session) -> Dict[str, Any]:
-        """Get comprehensive context data for the chatbot."""
+        """Get comprehensive context data for the chatbot.
+
+        Built from a constant number of queries: one for users, one for
+        groups (plus the selectin batch for members), two aggregates for
+        all paid/owed totals, and one window-function query for the
+        recent expenses of every group.
+        """
         try:
-            # Check cache first
-            cache_key = "chatbot_context"
+            # Versioned key: write endpoints bump chatbot_ctx_version, so
+            # a new version simply misses and rebuilds while the stale
+            # entry ages out with its TTL
+            cache_key = f"chatbot_context:v{self._context_version()}"
             cached_context = self.cache.get(cache_key)
             if cached_context:
                 return cached_context
-            
-            # Get all users
-            users = self.user_repo.get_multi(db, limit=1000)
-            users_data = [{"id": user.id, "name": user.name, "email": user.email} for user in users]
-            
-            # Get all groups with detailed information
+
+            # Get all users as plain rows
+            users_data = [
+                {"id": row.id, "name": row.name, "email": row.email}
+                for row in self.user_repo.get_user_rows(db, limit=1000)
+            ]
+
+            # All groups with members loaded up front
+            groups = self.group_repo.get_multi_with_users(db, limit=1000)
+
+            # Paid/owed totals for every (group, user) pair in two queries
+            totals = self.balance_repo.get_all_balance_totals(db)
+
+            # Last 10 expenses of every group from one ranked query
+            recent_by_group: Dict[int, list] = {}
+            for row in self.expense_repo.get_recent_expense_rows_per_group(db, per_group=10):
+                recent_by_group.setdefault(row.group_id, []).append({
+                    "id": row.id,
+                    "description": row.description,
+                    "amount": row.amount,
+                    "paid_by": {"id": row.paid_by, "name": row.paid_by_name},
+                    "split_type": row.split_type.value,
+                    "created_at": row.created_at.isoformat() if row.created_at else None
+                })
+
             groups_data = []
-            groups = self.group_repo.get_multi(db, limit=1000)
-            
             for group in groups:
-                # Get group with full context
-                full_group = self.group_repo.get_full_context(db, group.id)
-                if not full_group:
-                    continue
-                
-                # Calculate total expenses
-                total_expenses = sum(expense.amount for expense in full_group.expenses)
-                
-                # Get recent expenses (last 10)
-                recent_expenses = full_group.expenses[:10]  # Already ordered by created_at desc
-                expenses_data = []
-                
-                for expense in recent_expenses:
-                    expenses_data.append({
-                        "id": expense.id,
-                        "description": expense.description,
-                        "amount": expense.amount,
-                        "paid_by": {"id": expense.paid_by_user.id, "name": expense.paid_by_user.name},
-                        "split_type": expense.split_type.value,
-                        "created_at": expense.created_at.isoformat() if expense.created_at else None
+                balances = []
+                for user in group.users:
+                    paid, owed = totals.get((group.id, user.id), (0.0, 0.0))
+                    balances.append({
+                        "user_id": user.id,
+                        "group_id": group.id,
+                        "balance": paid - owed,
+                        "paid_total": paid,
+                        "owes_total": owed,
+                        "user_name": user.name
                     })
-                
-                # Calculate balances
-                from app.repositories.balances import BalanceRepository
-                balance_repo = BalanceRepository()
-                balances = balance_repo.get_group_balances(db, group.id)
-                
+                balances.sort(key=lambda x: x["balance"])
+
                 groups_data.append({
-                    "id": full_group.id,
-                    "name": full_group.name,
-                    "members": [{"id": user.id, "name": user.name} for user in full_group.users],
-                    "total_expenses": total_expenses,
-                    "recent_expenses": expenses_data,
+                    "id": group.id,
+                    "name": group.name,
+                    "members": [{"id": user.id, "name": user.name} for user in group.users],
+                    "total_expenses": float(group.total_expenses or 0),
+                    "recent_expenses": recent_by_group.get(group.id, []),
                     "balances": balances
                 })
-            
+
             context = {
                 "users": users_data,
                 "groups": groups_data,
@@ -136,76 +226,174 @@ class ChatbotService:
                     "total_expenses": sum(group["total_expenses"] for group in groups_data)
                 }
             }
-            
+
             # Cache context for 60 seconds
             self.cache.set(cache_key, context, ttl=60)
             return context
-            
+
         except Exception as e:
-            logger.error(f"Error getting chatbot context: {e}")
+            logger.error("Error getting chatbot context: %s", e)
             return {}
     
-    def _generate_response(self, query: str, context: Dict[str, Any]) -> str:
-        """Generate response using AI or fallback."""
-        if not settings.deepseek_api_key:
-            logger.info("No API key found, using fallback response")
-            return self._generate_fallback_response(query, context)
-        
-        try:
-            # Create system prompt with context
-            system_prompt = f"""
-You are a helpful assistant for a Splitwise expense-splitting application. You have access to the following data:
+    def stream_query(self, db: Session, query: str):
+        """Yield the chatbot answer as server-sent events.
 
-CONTEXT DATA:
-{json.dumps(context, indent=2)}
+        Cache hits and fallback answers arrive as a single event; AI
+        answers are forwarded chunk by chunk as DeepSeek generates them,
+        then cached whole for subsequent non-streaming queries.
+        """
+        digest = hashlib.sha256(
+            f"{query.strip().lower()}:{self._context_version()}".encode()
+        ).hexdigest()[:32]
+        cache_key = f"chatbot:{digest}"
 
-Answer user queries about expenses, balances, groups, and users based on this data. 
+        cached_response = self.cache.get(cache_key)
+        if cached_response:
+            yield b"data: " + orjson.dumps({"content": cached_response["response"]}) + b"\n\n"
+            yield b"data: [DONE]\n\n"
+            return
 
-FORMATTING GUIDELINES:
-- Use **bold** for important amounts and names
-- Use bullet points (•) for lists
-- Use tables when showing multiple balances or expenses
-- Use headings (##) to organize sections
-- Format monetary amounts as **$XX.XX**
-- Use user names instead of IDs when possible
+        context = self._get_chatbot_context(db)
 
-BALANCE INTERPRETATION:
-- Positive balance: person is owed money (they should receive)
-- Negative balance: person owes money (they should pay)
-- Zero balance: person is settled up
+        response_text = None
+        if _HAS_API_KEY:
+            try:
+                client = openai.OpenAI(
+                    api_key=settings.deepseek_api_key,
+                    base_url=settings.deepseek_base_url
+                )
+                stream = client.chat.completions.create(
+                    model=settings.deepseek_model,
+                    messages=[
+                        {"role": "system", "content": self._build_system_prompt(query, context)},
+                        {"role": "user", "content": query}
+                    ],
+                    max_tokens=settings.deepseek_max_tokens,
+                    temperature=settings.deepseek_temperature,
+                    stream=True
+                )
 
-Provide specific numbers and details when available. Be conversational and helpful.
-If data is not available, clearly mention what's missing.
+                parts = []
+                for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        parts.append(delta)
+                        yield b"data: " + orjson.dumps({"content": delta}) + b"\n\n"
+                response_text = "".join(parts).strip()
+            except Exception as e:
+                logger.error("AI streaming error: %s", e)
 
-Current capabilities:
-- Check balances for users in groups
-- Find recent expenses and who paid
-- Show group summaries and member information
-- Calculate totals and provide expense breakdowns
-"""
+        if response_text is None:
+            response_text = self._generate_fallback_response(query, context)
+            yield b"data: " + orjson.dumps({"content": response_text}) + b"\n\n"
+
+        # Cache the assembled answer in the same shape process_query uses
+        context_used = _CTX_USED_TEMPLATE.copy()
+        context_used["users_count"] = len(context.get("users", []))
+        context_used["groups_count"] = len(context.get("groups", []))
+        context_used["query_length"] = len(query)
+        self.cache.set(cache_key, {
+            "response": response_text,
+            "context_used": context_used,
+            "cached": False,
+            "response_time_ms": 0.0
+        }, ttl=settings.chatbot_response_cache_ttl)
+
+        yield b"data: [DONE]\n\n"
+
+    def _select_context(
+        self,
+        context: Dict[str, Any],
+        found_users: list,
+        found_groups: list
+    ) -> Dict[str, Any]:
+        """Slice the context down to what the query actually references.
+
+        Queries naming specific users or groups get only those slices;
+        untargeted queries keep every group but with recent expenses
+        capped, so the prompt stays bounded as data grows.
+        """
+        users = context.get("users", [])
+        groups = context.get("groups", [])
+
+        # A named user without a named group pulls in their groups
+        if found_users and not found_groups:
+            found_ids = {user["id"] for user in found_users}
+            found_groups = [
+                group for group in groups
+                if any(member["id"] in found_ids for member in group.get("members", []))
+            ]
+
+        selected_groups = []
+        for group in found_groups or groups:
+            slim = dict(group)
+            slim["recent_expenses"] = [
+                {key: value for key, value in expense.items() if key != "created_at"}
+                for expense in slim.get("recent_expenses", [])[:3]
+            ]
+            selected_groups.append(slim)
+
+        return {
+            "users": found_users or users,
+            "groups": selected_groups,
+            "summary": context.get("summary", {})
+        }
+
+    def _build_system_prompt(self, query: str, context: Dict[str, Any]) -> str:
+        """Render the system prompt: fixed instructions, then compact context.
+
+        Untargeted queries all share the same full-context rendering, so
+        that one is cached per context version instead of re-serializing
+        the whole dataset on every call.
+        """
+        found_users, found_groups = self._find_names_in_query(query.lower(), context)
+
+        if not found_users and not found_groups:
+            prompt_key = f"chatbot_sysprompt:v{self._context_version()}"
+            cached_prompt = self.cache.get(prompt_key)
+            if cached_prompt:
+                return cached_prompt
 
+        selected = self._select_context(context, found_users, found_groups)
+        prompt = (
+            f"{_SYSTEM_INSTRUCTIONS}\n"
+            f"CONTEXT DATA:\n{orjson.dumps(selected).decode()}\n"
+        )
+
+        if not found_users and not found_groups:
+            self.cache.set(prompt_key, prompt, ttl=60)
+
+        return prompt
+
+    def _generate_response(self, query: str, context: Dict[str, Any]) -> str:
+        """Generate response using AI or fallback."""
+        if not _HAS_API_KEY:
+            logger.info("No API key found, using fallback response")
+            return self._generate_fallback_response(query, context)
+
+        try:
             # Use OpenAI API
             client = openai.OpenAI(
-                api_key=settings.deepseek_api_key, 
+                api_key=settings.deepseek_api_key,
                 base_url=settings.deepseek_base_url
             )
 
             response = client.chat.completions.create(
                 model=settings.deepseek_model,
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": self._build_system_prompt(query, context)},
                     {"role": "user", "content": query}
                 ],
                 max_tokens=settings.deepseek_max_tokens,
                 temperature=settings.deepseek_temperature
             )
-            
+
             ai_response = response.choices[0].message.content.strip()
-            logger.info(f"AI response generated successfully for query: '{query[:50]}...'")
+            logger.info("AI response generated successfully for query: '%.50s...'", query)
             return ai_response
-            
+
         except Exception as e:
-            logger.error(f"AI API error: {e}")
+            logger.error("AI API error: %s", e)
             return self._generate_fallback_response(query, context)
     
     def _generate_fallback_response(self, query: str, context: Dict[str, Any]) -> str:
@@ -216,7 +404,8 @@ Current capabilities:
             users = context.get("users", [])
             groups = context.get("groups", [])
             
-            logger.info(f"Processing fallback for query: '{query}' with {len(users)} users and {len(groups)} groups")
+            logger.debug("Processing fallback for query: '%s' with %d users and %d groups",
+                         query, len(users), len(groups))
             
             # Pattern matching for different types of queries
             balance_keywords = ["owe", "owes", "balance", "balances", "debt", "money", "amount"]
@@ -229,9 +418,8 @@ Current capabilities:
             has_recent = any(keyword in query_lower for keyword in recent_keywords)
             has_group = any(keyword in query_lower for keyword in group_keywords)
             
-            # Find mentioned users and groups
-            found_users = self._find_users_in_query(query_lower, users)
-            found_groups = self._find_groups_in_query(query_lower, groups)
+            # Find mentioned users and groups in one scan
+            found_users, found_groups = self._find_names_in_query(query_lower, context)
             
             # Generate appropriate response
             if has_balance:
@@ -246,29 +434,66 @@ Current capabilities:
                 return self._handle_default_query(users, groups, query)
                 
         except Exception as e:
-            logger.error(f"Fallback response error: {e}")
+            logger.error("Fallback response error: %s", e)
             return "❌ Sorry, I encountered an error processing your request. Please try again."
     
-    def _find_users_in_query(self, query_lower: str, users: list) -> list:
-        """Find users mentioned in the query."""
-        found_users = []
+    def _compile_name_matcher(self, users: list, groups: list):
+        """Build one compiled alternation over every known name variant.
+
+        Users match on their full name or first name, groups on their
+        full name or any word of it — same substring semantics as the
+        old per-name loops, but applied in a single scan of the query.
+        """
+        variants: Dict[str, list] = {}
         for user in users:
-            user_name_variations = [
-                user["name"].lower(),
-                user["name"].lower().split()[0] if " " in user["name"] else user["name"].lower()
-            ]
-            if any(variation in query_lower for variation in user_name_variations):
-                found_users.append(user)
-        return found_users
-    
-    def _find_groups_in_query(self, query_lower: str, groups: list) -> list:
-        """Find groups mentioned in the query."""
-        found_groups = []
+            name = user["name"].lower()
+            first = name.split()[0] if " " in name else name
+            variants.setdefault(name, []).append(("user", user["id"]))
+            variants.setdefault(first, []).append(("user", user["id"]))
         for group in groups:
-            group_name_lower = group["name"].lower()
-            if group_name_lower in query_lower or any(word in query_lower for word in group_name_lower.split()):
-                found_groups.append(group)
-        return found_groups
+            name = group["name"].lower()
+            variants.setdefault(name, []).append(("group", group["id"]))
+            for word in name.split():
+                variants.setdefault(word, []).append(("group", group["id"]))
+
+        if not variants:
+            return None, variants
+
+        # Longest variants first so full names win over their prefixes
+        pattern = re.compile(
+            "|".join(re.escape(v) for v in sorted(variants, key=len, reverse=True))
+        )
+        return pattern, variants
+
+    def _find_names_in_query(self, query_lower: str, context: Dict[str, Any]) -> tuple:
+        """Find users and groups mentioned in the query in one pass.
+
+        The matcher is cached per context version, so directories are
+        only recompiled after a write.
+        """
+        users = context.get("users", [])
+        groups = context.get("groups", [])
+
+        matcher_key = f"chatbot_name_matcher:v{self._context_version()}"
+        matcher = self.cache.get(matcher_key)
+        if matcher is None:
+            matcher = self._compile_name_matcher(users, groups)
+            self.cache.set(matcher_key, matcher, ttl=60)
+
+        pattern, variants = matcher
+        found_user_ids = set()
+        found_group_ids = set()
+        if pattern is not None:
+            for match in pattern.finditer(query_lower):
+                for kind, ident in variants[match.group(0)]:
+                    if kind == "user":
+                        found_user_ids.add(ident)
+                    else:
+                        found_group_ids.add(ident)
+
+        found_users = [user for user in users if user["id"] in found_user_ids]
+        found_groups = [group for group in groups if group["id"] in found_group_ids]
+        return found_users, found_groups
     
     def _handle_balance_query(self, found_users: list, found_groups: list, users: list, groups: list) -> str:
         """Handle balance-related queries."""
@@ -323,24 +548,15 @@ Current capabilities:
     
     def _handle_default_query(self, users: list, groups: list, query: str) -> str:
         """Handle default/unknown queries."""
-        return f"""## 🤖 Splitwise Assistant
-
-I found **{len(users)} users** and **{len(groups)} groups** in your data.
-
-You asked: *"{query}"*
-
-### 📊 Quick Overview:
-• **Users**: {', '.join([u['name'] for u in users[:3]])}{'...' if len(users) > 3 else ''}
-• **Groups**: {', '.join([g['name'] for g in groups[:3]])}{'...' if len(groups) > 3 else ''}
-
-### 💡 Try asking:
-• **"How much does {users[0]['name'] if users else '[name]'} owe in {groups[0]['name'] if groups else '[group]'}?"**
-• **"Show me recent expenses"**
-• **"Who paid the most in {groups[0]['name'] if groups else '[group]'}?"**
-• **"List all groups"**
-• **"What are {users[0]['name'] if users else '[name]'}'s balances?"**
-
-What would you like to know? 😊"""
+        return _DEFAULT_RESPONSE_TEMPLATE.format(
+            user_count=len(users),
+            group_count=len(groups),
+            query=query,
+            user_names=', '.join([u['name'] for u in users[:3]]) + ('...' if len(users) > 3 else ''),
+            group_names=', '.join([g['name'] for g in groups[:3]]) + ('...' if len(groups) > 3 else ''),
+            example_user=users[0]['name'] if users else '[name]',
+            example_group=groups[0]['name'] if groups else '[group]'
+        )
     
     def _get_specific_balance(self, user: dict, group: dict, groups: list) -> str:
         """Get balance for specific user in specific group."""
@@ -9,6 +9,7 @@ from app.repositories.expenses import ExpenseRepository, ExpenseSplitRepository
 from app.repositories.groups import GroupRepository
 from app.repositories.users import UserRepository
 from app.repositories.balances import BalanceRepository
+from app.core.dependencies import cache_manager
 from app.schemas.expenses import (
     ExpenseCreate, ExpenseUpdate, ExpenseResponse, ExpenseSummary,
     ExpenseSplitResponse
@@ -17,6 +18,12 @@ from app.models.database import SplitType
 
 logger = logging.getLogger(__name__)
 
+# Literal-validated input values map straight to enum members without
+# re-running the enum lookup per expense
+_SPLIT_TYPE_MAP = {
+    "equal": SplitType.EQUAL,
+    "percentage": SplitType.PERCENTAGE
+}
 
 class ExpenseService:
     """Service class for expense-related business logic."""
@@ -27,114 +34,106 @@ class ExpenseService:
         self.group_repo = GroupRepository()
         self.user_repo = UserRepository()
         self.balance_repo = BalanceRepository()
-    
+        self.cache = cache_manager
+
+    def _invalidate_group_response_cache(self, group_id: int) -> None:
+        """Expense writes change group totals, so cached group reads go."""
+        self.cache.delete(f"group_response:{group_id}")
+        self.cache.delete_prefix("groups_list:")
+
     def create_expense(self, db: Session, group_id: int, expense_data: ExpenseCreate) -> ExpenseResponse:
         """Create a new expense with splits."""
-        try:
-            # Verify group exists
-            group = self.group_repo.get_with_users(db, group_id)
-            if not group:
-                raise HTTPException(
-                    status_code=404,
-                    detail="Group not found"
-                )
-            
-            # Verify paid_by user is in the group
-            group_user_ids = [user.id for user in group.users]
-            if expense_data.paid_by not in group_user_ids:
+        # Verify group exists (identity-map lookup, no user hydration)
+        group = self.group_repo.get(db, group_id)
+        if not group:
+            raise HTTPException(
+                status_code=404,
+                detail="Group not found"
+            )
+
+        # Membership comes straight from the association table: the write
+        # path only needs ids, not User objects
+        member_ids = self.user_repo.get_user_ids_in_group(db, group_id)
+        group_user_ids = set(member_ids)
+        if expense_data.paid_by not in group_user_ids:
+            raise HTTPException(
+                status_code=400,
+                detail="User who paid is not in the group"
+            )
+        
+        # Prepare expense data
+        expense_dict = {
+            "description": expense_data.description,
+            "amount": expense_data.amount,
+            "group_id": group_id,
+            "paid_by": expense_data.paid_by,
+            "split_type": _SPLIT_TYPE_MAP[expense_data.split_type]
+        }
+        
+        # Prepare splits data
+        splits_data = []
+        
+        if expense_data.split_type == "equal":
+            # Equal split among all group members using integer cents,
+            # distributing any remainder so the splits sum exactly to the total
+            total_cents = round(expense_data.amount * 100)
+            base_cents, remainder = divmod(total_cents, len(member_ids))
+            for i, user_id in enumerate(member_ids):
+                splits_data.append({
+                    "user_id": user_id,
+                    "amount": (base_cents + (1 if i < remainder else 0)) / 100
+                })
+        
+        elif expense_data.split_type == "percentage":
+            # Percentage-based split
+            if not expense_data.splits:
                 raise HTTPException(
                     status_code=400,
-                    detail="User who paid is not in the group"
+                    detail="Splits must be provided for percentage split type"
                 )
             
-            # Prepare expense data
-            expense_dict = {
-                "description": expense_data.description,
-                "amount": expense_data.amount,
-                "group_id": group_id,
-                "paid_by": expense_data.paid_by,
-                "split_type": SplitType(expense_data.split_type)
-            }
-            
-            # Prepare splits data
-            splits_data = []
-            
-            if expense_data.split_type == "equal":
-                # Equal split among all group members
-                split_amount = expense_data.amount / len(group.users)
-                for user in group.users:
-                    splits_data.append({
-                        "user_id": user.id,
-                        "amount": split_amount
-                    })
-            
-            elif expense_data.split_type == "percentage":
-                # Percentage-based split
-                if not expense_data.splits:
+            for split_input in expense_data.splits:
+                # Verify user is in group
+                if split_input.user_id not in group_user_ids:
                     raise HTTPException(
                         status_code=400,
-                        detail="Splits must be provided for percentage split type"
+                        detail=f"User {split_input.user_id} is not in the group"
                     )
                 
-                for split_input in expense_data.splits:
-                    # Verify user is in group
-                    if split_input.user_id not in group_user_ids:
-                        raise HTTPException(
-                            status_code=400,
-                            detail=f"User {split_input.user_id} is not in the group"
-                        )
-                    
-                    split_amount = (split_input.percentage / 100) * expense_data.amount
-                    splits_data.append({
-                        "user_id": split_input.user_id,
-                        "amount": split_amount,
-                        "percentage": split_input.percentage
-                    })
-            
-            # Create expense with splits
-            expense = self.expense_repo.create_expense_with_splits(
-                db, expense_dict, splits_data
-            )
-            
-            # Invalidate balance caches
-            for user in group.users:
-                self.balance_repo.invalidate_balance_cache(user.id, group_id)
-            
-            logger.info(f"Created expense: {expense.description} for group {group_id}")
-            
-            # Convert to response format
-            return self._expense_to_response(expense)
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error creating expense: {e}")
-            raise HTTPException(
-                status_code=500,
-                detail="Failed to create expense"
-            )
-    
+                split_amount = (split_input.percentage / 100) * expense_data.amount
+                splits_data.append({
+                    "user_id": split_input.user_id,
+                    "amount": split_amount,
+                    "percentage": split_input.percentage
+                })
+        
+        # Create expense with splits
+        expense = self.expense_repo.create_expense_with_splits(
+            db, expense_dict, splits_data
+        )
+        
+        # Invalidate balance caches
+        for user_id in member_ids:
+            self.balance_repo.invalidate_balance_cache(user_id, group_id)
+        self._invalidate_group_response_cache(group_id)
+
+
+        logger.info(f"Created expense: {expense.description} for group {group_id}")
+        
+        # Convert to response format
+        return self._expense_to_response(expense)
+
     def get_expense(self, db: Session, expense_id: int) -> ExpenseResponse:
         """Get expense by ID with all details."""
-        try:
-            expense = self.expense_repo.get_with_splits(db, expense_id)
-            if not expense:
-                raise HTTPException(
-                    status_code=404,
-                    detail="Expense not found"
-                )
-            
-            return self._expense_to_response(expense)
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error getting expense {expense_id}: {e}")
+        rows = self.expense_repo.get_expense_rows(db, expense_id)
+        if not rows:
             raise HTTPException(
-                status_code=500,
-                detail="Failed to retrieve expense"
+                status_code=404,
+                detail="Expense not found"
             )
-    
+
+        return self._expense_response_from_rows(rows)
+
     def get_group_expenses(
         self,
         db: Session,
@@ -144,147 +143,147 @@ class ExpenseService:
         order_by: str = "created_at"
     ) -> List[ExpenseSummary]:
         """Get expenses for a group."""
-        try:
-            # Verify group exists
-            group = self.group_repo.get(db, group_id)
-            if not group:
-                raise HTTPException(
-                    status_code=404,
-                    detail="Group not found"
-                )
-            
-            expenses = self.expense_repo.get_group_expenses(
-                db, group_id, skip, limit, order_by, desc_order=True
-            )
-            
-            return [
-                ExpenseSummary(
-                    id=expense.id,
-                    description=expense.description,
-                    amount=expense.amount,
-                    paid_by_name=expense.paid_by_user.name,
-                    split_type=expense.split_type.value,
-                    created_at=expense.created_at
-                )
-                for expense in expenses
-            ]
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error getting group expenses for {group_id}: {e}")
+        # Verify group exists
+        group = self.group_repo.get(db, group_id)
+        if not group:
             raise HTTPException(
-                status_code=500,
-                detail="Failed to retrieve group expenses"
+                status_code=404,
+                detail="Group not found"
             )
-    
+        
+        rows = self.expense_repo.get_group_expense_rows(
+            db, group_id, skip, limit, order_by, desc_order=True
+        )
+
+        return [
+            ExpenseSummary(
+                id=row.id,
+                description=row.description,
+                amount=row.amount,
+                paid_by_name=row.paid_by_name,
+                split_type=row.split_type.value,
+                created_at=row.created_at
+            )
+            for row in rows
+        ]
+
     def update_expense(self, db: Session, expense_id: int, expense_data: ExpenseUpdate) -> ExpenseResponse:
         """Update expense information (limited updates)."""
-        try:
-            expense = self.expense_repo.get_with_splits(db, expense_id)
-            if not expense:
-                raise HTTPException(
-                    status_code=404,
-                    detail="Expense not found"
-                )
-            
-            # Only allow updating description and amount
-            update_data = expense_data.dict(exclude_unset=True)
-            
-            if update_data:
-                updated_expense = self.expense_repo.update(
-                    db, db_obj=expense, obj_in=update_data
-                )
-                
-                # If amount was updated, recalculate splits for equal split type
-                if "amount" in update_data and expense.split_type == SplitType.EQUAL:
-                    # Update split amounts
-                    for split in expense.splits:
-                        new_amount = updated_expense.amount / len(expense.splits)
-                        self.split_repo.update(
-                            db, db_obj=split, obj_in={"amount": new_amount}
-                        )
-                
-                # Invalidate caches
-                group_users = self.user_repo.get_users_in_group(db, expense.group_id)
-                for user in group_users:
-                    self.balance_repo.invalidate_balance_cache(user.id, expense.group_id)
-                
-                # Refresh expense
-                updated_expense = self.expense_repo.get_with_splits(db, expense_id)
-                
-                logger.info(f"Updated expense: {updated_expense.description}")
-                return self._expense_to_response(updated_expense)
-            
-            return self._expense_to_response(expense)
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error updating expense {expense_id}: {e}")
+        expense = self.expense_repo.get_with_splits(db, expense_id)
+        if not expense:
             raise HTTPException(
-                status_code=500,
-                detail="Failed to update expense"
+                status_code=404,
+                detail="Expense not found"
             )
-    
-    def delete_expense(self, db: Session, expense_id: int) -> Dict[str, str]:
-        """Delete expense and its splits."""
-        try:
-            expense = self.expense_repo.get_with_splits(db, expense_id)
-            if not expense:
-                raise HTTPException(
-                    status_code=404,
-                    detail="Expense not found"
+        
+        # Only allow updating description and amount
+        update_data = expense_data.dict(exclude_unset=True)
+
+        if update_data:
+            # Adjust the denormalized group total in the same transaction
+            if "amount" in update_data:
+                self.group_repo.adjust_total_expenses(
+                    db, expense.group_id, update_data["amount"] - expense.amount,
+                    commit=False
                 )
+
+            updated_expense = self.expense_repo.update(
+                db, db_obj=expense, obj_in=update_data
+            )
             
-            group_id = expense.group_id
-            
-            # Get affected users for cache invalidation
-            group_users = self.user_repo.get_users_in_group(db, group_id)
-            
-            # Remove expense (splits will be cascade deleted)
-            self.expense_repo.remove(db, id=expense_id)
+            # If amount was updated, recalculate splits for equal split type
+            if "amount" in update_data and expense.split_type == SplitType.EQUAL:
+                # Update split amounts
+                for split in expense.splits:
+                    new_amount = updated_expense.amount / len(expense.splits)
+                    self.split_repo.update(
+                        db, db_obj=split, obj_in={"amount": new_amount}
+                    )
             
             # Invalidate caches
-            for user in group_users:
-                self.balance_repo.invalidate_balance_cache(user.id, group_id)
-            
-            logger.info(f"Deleted expense: {expense.description}")
-            return {"message": "Expense deleted successfully"}
+            user_ids = self.user_repo.get_user_ids_in_group(db, expense.group_id)
+            for user_id in user_ids:
+                self.balance_repo.invalidate_balance_cache(user_id, expense.group_id)
+            self._invalidate_group_response_cache(expense.group_id)
+
+
+            # Refresh expense
+            updated_expense = self.expense_repo.get_with_splits(db, expense_id)
             
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error deleting expense {expense_id}: {e}")
+            logger.info(f"Updated expense: {updated_expense.description}")
+            return self._expense_to_response(updated_expense)
+        
+        return self._expense_to_response(expense)
+
+    def delete_expense(self, db: Session, expense_id: int) -> Dict[str, str]:
+        """Delete expense and its splits."""
+        expense = self.expense_repo.get_with_splits(db, expense_id)
+        if not expense:
             raise HTTPException(
-                status_code=500,
-                detail="Failed to delete expense"
+                status_code=404,
+                detail="Expense not found"
             )
-    
+        
+        group_id = expense.group_id
+        
+        # Get affected user IDs for cache invalidation
+        user_ids = self.user_repo.get_user_ids_in_group(db, group_id)
+
+        # Remove expense (splits will be cascade deleted); the group
+        # total adjustment commits together with the delete
+        self.group_repo.adjust_total_expenses(
+            db, group_id, -expense.amount, commit=False
+        )
+        self.expense_repo.remove(db, id=expense_id)
+
+        # Invalidate caches
+        for user_id in user_ids:
+            self.balance_repo.invalidate_balance_cache(user_id, group_id)
+        self._invalidate_group_response_cache(group_id)
+
+        logger.info(f"Deleted expense: {expense.description}")
+        return {"message": "Expense deleted successfully"}
+
     def get_expense_statistics(self, db: Session, group_id: Optional[int] = None) -> Dict[str, Any]:
         """Get expense statistics."""
-        try:
-            if group_id:
-                # Verify group exists
-                group = self.group_repo.get(db, group_id)
-                if not group:
-                    raise HTTPException(
-                        status_code=404,
-                        detail="Group not found"
-                    )
-            
-            stats = self.expense_repo.get_expense_statistics(db, group_id)
-            return stats
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error getting expense statistics: {e}")
-            raise HTTPException(
-                status_code=500,
-                detail="Failed to retrieve expense statistics"
+        if group_id:
+            # Verify group exists
+            group = self.group_repo.get(db, group_id)
+            if not group:
+                raise HTTPException(
+                    status_code=404,
+                    detail="Group not found"
+                )
+        
+        stats = self.expense_repo.get_expense_statistics(db, group_id)
+        return stats
+
+    def _expense_response_from_rows(self, rows) -> ExpenseResponse:
+        """Build an expense response from the flat rows of a single JOIN."""
+        first = rows[0]
+        splits = [
+            ExpenseSplitResponse(
+                user_id=row.split_user_id,
+                user_name=row.split_user_name,
+                amount=row.split_amount,
+                percentage=row.split_percentage
             )
-    
+            for row in rows
+            if row.split_user_id is not None
+        ]
+
+        return ExpenseResponse(
+            id=first.id,
+            description=first.description,
+            amount=first.amount,
+            group_id=first.group_id,
+            paid_by=first.paid_by,
+            paid_by_name=first.paid_by_name,
+            split_type=first.split_type.value,
+            splits=splits,
+            created_at=first.created_at
+        )
+
     def _expense_to_response(self, expense) -> ExpenseResponse:
         """Convert expense model to response schema."""
         splits = [
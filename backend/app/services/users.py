@@ -4,14 +4,20 @@ User service with business logic and validation.
 import logging
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
+from pydantic import TypeAdapter
 from app.repositories.users import UserRepository
 from app.repositories.balances import BalanceRepository
+from app.core.dependencies import cache_manager
+from app.models.database import User
 from app.schemas.users import UserCreate, UserUpdate, UserResponse, UserSummary
-from app.schemas.balances import UserBalanceResponse
 
 logger = logging.getLogger(__name__)
 
+# Prebuilt list validator: one compiled validation pass over the whole
+# list instead of a from_orm call per item
+_USER_LIST_ADAPTER = TypeAdapter(List[UserResponse])
 
 class UserService:
     """Service class for user-related business logic."""
@@ -19,35 +25,55 @@ class UserService:
     def __init__(self):
         self.user_repo = UserRepository()
         self.balance_repo = BalanceRepository()
+        self.cache = cache_manager
     
     def create_user(self, db: Session, user_data: UserCreate) -> UserResponse:
         """Create a new user with validation."""
+        # The unique constraint on email is the source of truth: inserting
+        # directly is one round trip and race-safe, unlike a SELECT first
         try:
-            # Check if email already exists
-            existing_user = self.user_repo.get_by_email(db, user_data.email)
-            if existing_user:
-                logger.warning(f"Attempt to create user with existing email: {user_data.email}")
-                raise HTTPException(
-                    status_code=400, 
-                    detail="Email already registered"
-                )
-            
-            # Create user
-            user_dict = user_data.dict()
-            user = self.user_repo.create(db, obj_in=user_dict)
-            
-            logger.info(f"Created user: {user.name} ({user.email})")
-            return UserResponse.from_orm(user)
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error creating user: {e}")
+            user = self.user_repo.create(db, obj_in=user_data.dict())
+        except IntegrityError:
+            db.rollback()
+            logger.warning(f"Attempt to create user with existing email: {user_data.email}")
             raise HTTPException(
-                status_code=500,
-                detail="Failed to create user"
+                status_code=400,
+                detail="Email already registered"
             )
-    
+
+        # User names/emails feed the chatbot context
+        self.cache.increment("chatbot_ctx_version")
+
+        logger.info(f"Created user: {user.name} ({user.email})")
+        return UserResponse.model_validate(user)
+
+    def create_users_bulk(self, db: Session, users_data: List[UserCreate]) -> List[UserResponse]:
+        """Create multiple users with one duplicate check and one insert batch."""
+        # Single IN query instead of one email lookup per user
+        existing_emails = self.user_repo.get_existing_emails(
+            db, [user_data.email for user_data in users_data]
+        )
+
+        seen_emails = set()
+        new_users = []
+        for user_data in users_data:
+            if user_data.email in existing_emails or user_data.email in seen_emails:
+                logger.warning(f"Skipping duplicate email in bulk create: {user_data.email}")
+                continue
+            seen_emails.add(user_data.email)
+            new_users.append(User(**user_data.model_dump()))
+
+        if new_users:
+            # add_all + eager_defaults batches the INSERTs and brings
+            # back created_at via RETURNING; bulk_save_objects would
+            # leave the server defaults unloaded and break the response
+            db.add_all(new_users)
+            db.commit()
+            self.cache.increment("chatbot_ctx_version")
+
+        logger.info(f"Bulk created {len(new_users)} users ({len(users_data) - len(new_users)} duplicates skipped)")
+        return [UserResponse.model_validate(user) for user in new_users]
+
     def get_user(self, db: Session, user_id: int) -> UserResponse:
         """Get user by ID."""
         user = self.user_repo.get(db, user_id)
@@ -56,173 +82,125 @@ class UserService:
                 status_code=404,
                 detail="User not found"
             )
-        return UserResponse.from_orm(user)
+        return UserResponse.model_validate(user)
     
     def get_users(
-        self, 
-        db: Session, 
-        skip: int = 0, 
+        self,
+        db: Session,
+        skip: int = 0,
         limit: int = 100,
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        after_id: Optional[int] = None
     ) -> List[UserResponse]:
-        """Get users with optional search."""
-        try:
-            if search:
-                users = self.user_repo.search_by_name(db, search, limit)
-            else:
-                users = self.user_repo.get_multi(
-                    db, 
-                    skip=skip, 
-                    limit=limit,
-                    order_by="name"
-                )
-            
-            return [UserResponse.from_orm(user) for user in users]
-            
-        except Exception as e:
-            logger.error(f"Error getting users: {e}")
-            raise HTTPException(
-                status_code=500,
-                detail="Failed to retrieve users"
+        """Get users with optional search and cursor pagination."""
+        if search:
+            users = self.user_repo.search_by_name(db, search, limit)
+        else:
+            # Row tuples with just the response columns; no ORM hydration
+            users = self.user_repo.get_user_rows(
+                db, skip=skip, limit=limit, after_id=after_id
             )
-    
+
+        return _USER_LIST_ADAPTER.validate_python(users, from_attributes=True)
+
     def update_user(self, db: Session, user_id: int, user_data: UserUpdate) -> UserResponse:
         """Update user information."""
-        try:
-            user = self.user_repo.get(db, user_id)
-            if not user:
-                raise HTTPException(
-                    status_code=404,
-                    detail="User not found"
-                )
-            
-            # Check email uniqueness if email is being updated
-            if user_data.email and user_data.email != user.email:
-                if self.user_repo.check_email_exists(db, user_data.email, exclude_id=user_id):
-                    raise HTTPException(
-                        status_code=400,
-                        detail="Email already registered"
-                    )
-            
-            # Update user
-            update_data = user_data.dict(exclude_unset=True)
-            updated_user = self.user_repo.update(db, db_obj=user, obj_in=update_data)
-            
-            logger.info(f"Updated user: {updated_user.name}")
-            return UserResponse.from_orm(updated_user)
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error updating user {user_id}: {e}")
+        user = self.user_repo.get(db, user_id)
+        if not user:
             raise HTTPException(
-                status_code=500,
-                detail="Failed to update user"
-            )
-    
-    def delete_user(self, db: Session, user_id: int) -> Dict[str, str]:
-        """Delete user (soft delete or validation)."""
-        try:
-            user = self.user_repo.get(db, user_id)
-            if not user:
-                raise HTTPException(
-                    status_code=404,
-                    detail="User not found"
-                )
-            
-            # Check if user has any financial obligations
-            balances = self.balance_repo.get_user_all_balances(db, user_id)
-            has_outstanding_balance = any(
-                abs(balance["balance"]) > 0.01 for balance in balances
+                status_code=404,
+                detail="User not found"
             )
-            
-            if has_outstanding_balance:
+        
+        # Check email uniqueness if email is being updated
+        if user_data.email and user_data.email != user.email:
+            if self.user_repo.check_email_exists(db, user_data.email, exclude_id=user_id):
                 raise HTTPException(
                     status_code=400,
-                    detail="Cannot delete user with outstanding balances. Please settle all debts first."
+                    detail="Email already registered"
                 )
-            
-            # Remove user
-            self.user_repo.remove(db, id=user_id)
-            
-            # Invalidate caches
-            self.balance_repo.invalidate_balance_cache(user_id=user_id)
-            
-            logger.info(f"Deleted user: {user.name}")
-            return {"message": "User deleted successfully"}
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error deleting user {user_id}: {e}")
+        
+        # Only write fields that actually changed; a payload that matches
+        # the stored row becomes a no-op instead of an UPDATE
+        update_data = user_data.model_dump(exclude_unset=True)
+        changed = {
+            field: value
+            for field, value in update_data.items()
+            if getattr(user, field) != value
+        }
+        if not changed:
+            return UserResponse.model_validate(user)
+
+        updated_user = self.user_repo.update(db, db_obj=user, obj_in=changed)
+        self.cache.increment("chatbot_ctx_version")
+
+        logger.info(f"Updated user: {updated_user.name}")
+        return UserResponse.model_validate(updated_user)
+
+    def delete_user(self, db: Session, user_id: int) -> Dict[str, str]:
+        """Delete user (soft delete or validation)."""
+        user = self.user_repo.get(db, user_id)
+        if not user:
             raise HTTPException(
-                status_code=500,
-                detail="Failed to delete user"
+                status_code=404,
+                detail="User not found"
             )
-    
-    def get_user_balances(self, db: Session, user_id: int) -> List[UserBalanceResponse]:
-        """Get user balances across all groups."""
-        try:
-            user = self.user_repo.get(db, user_id)
-            if not user:
-                raise HTTPException(
-                    status_code=404,
-                    detail="User not found"
-                )
-            
-            balances = self.balance_repo.get_user_all_balances(db, user_id)
-            
-            return [
-                UserBalanceResponse(
-                    group_id=balance["group_id"],
-                    group_name=balance["group_name"],
-                    balance=balance["balance"],
-                    paid_total=balance["paid_total"],
-                    owes_total=balance["owes_total"]
-                )
-                for balance in balances
-            ]
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error getting user balances for {user_id}: {e}")
+        
+        # Check if user has any financial obligations (single SQL probe)
+        if self.balance_repo.user_has_outstanding_balance(db, user_id):
             raise HTTPException(
-                status_code=500,
-                detail="Failed to retrieve user balances"
+                status_code=400,
+                detail="Cannot delete user with outstanding balances. Please settle all debts first."
             )
-    
+        
+        # Remove user
+        self.user_repo.remove(db, id=user_id)
+        
+        # Invalidate caches
+        self.balance_repo.invalidate_balance_cache(user_id=user_id)
+        
+        logger.info(f"Deleted user: {user.name}")
+        return {"message": "User deleted successfully"}
+
+    def get_user_balances(self, db: Session, user_id: int) -> List[Dict[str, Any]]:
+        """Get user balances across all groups.
+
+        Returns the repository's response-shaped dicts as-is; the rows
+        are built from known view columns, so re-validating them into
+        UserBalanceResponse objects only to dump them again is skipped.
+        """
+        user = self.user_repo.get(db, user_id)
+        if not user:
+            raise HTTPException(
+                status_code=404,
+                detail="User not found"
+            )
+
+        return self.balance_repo.get_user_all_balances(db, user_id)
+
     def get_user_summary(self, db: Session, user_id: int) -> Dict[str, Any]:
         """Get comprehensive user summary."""
-        try:
-            user = self.user_repo.get_with_groups(db, user_id)
-            if not user:
-                raise HTTPException(
-                    status_code=404,
-                    detail="User not found"
-                )
-            
-            balances = self.balance_repo.get_user_all_balances(db, user_id)
-            balance_summary = self.balance_repo.get_balance_summary(db, user_id)
-            
-            return {
-                "user": UserResponse.from_orm(user),
-                "groups_count": len(user.groups),
-                "groups": [
-                    {"id": group.id, "name": group.name} 
-                    for group in user.groups
-                ],
-                "total_balance": balance_summary["total_balance"],
-                "groups_with_debt": balance_summary["groups_with_debt"],
-                "groups_with_credit": balance_summary["groups_with_credit"],
-                "balances": balances
-            }
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error getting user summary for {user_id}: {e}")
+        user = self.user_repo.get(db, user_id)
+        if not user:
             raise HTTPException(
-                status_code=500,
-                detail="Failed to retrieve user summary"
+                status_code=404,
+                detail="User not found"
             )
+
+        # One balance result set; totals and debt counts derive from it in
+        # Python instead of issuing a second round of aggregate queries
+        balances = self.balance_repo.get_user_all_balances(db, user_id)
+
+        return {
+            "user": UserResponse.model_validate(user),
+            "groups_count": len(balances),
+            "groups": [
+                {"id": balance["group_id"], "name": balance["group_name"]}
+                for balance in balances
+            ],
+            "total_balance": sum(b["balance"] for b in balances),
+            "groups_with_debt": len([b for b in balances if b["balance"] < 0]),
+            "groups_with_credit": len([b for b in balances if b["balance"] > 0]),
+            "balances": balances
+        }
+        
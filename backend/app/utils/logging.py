@@ -6,6 +6,12 @@ import sys
 from typing import Optional
 from app.core.config import settings
 
+# O(1) level lookup instead of getattr on every call
+_LEVEL_MAP = {
+    name: getattr(logging, name)
+    for name in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+}
+
 
 def setup_logging(
     level: str = None,
@@ -24,23 +30,23 @@ def setup_logging(
     log_format = log_format or settings.log_format
     
     # Convert string level to logging constant
-    numeric_level = getattr(logging, level.upper(), logging.INFO)
-    
-    # Configure root logger
-    logging.basicConfig(
-        level=numeric_level,
-        format=log_format,
-        handlers=[
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
-    
-    # Add file handler if specified
+    numeric_level = _LEVEL_MAP.get(level.upper(), logging.INFO)
+
+    # One Formatter instance shared by all handlers
+    formatter = logging.Formatter(log_format)
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+    handlers = [stream_handler]
+
     if log_file:
         file_handler = logging.FileHandler(log_file)
-        file_handler.setFormatter(logging.Formatter(log_format))
-        logging.getLogger().addHandler(file_handler)
-    
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+
+    # Configure root logger with all handlers in one pass
+    logging.basicConfig(level=numeric_level, handlers=handlers)
+
     # Set specific logger levels
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
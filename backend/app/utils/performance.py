@@ -1,9 +1,11 @@
 """
 Performance monitoring and metrics utilities.
 """
+import os
 import time
 import functools
 import logging
+from collections import deque
 from typing import Dict, Any, Callable, Optional
 from contextlib import contextmanager
 
@@ -11,41 +13,50 @@ logger = logging.getLogger(__name__)
 
 
 class PerformanceMonitor:
-    """Simple performance monitoring utility."""
-    
+    """Simple performance monitoring utility.
+
+    Keeps O(1) running aggregates per metric instead of storing every
+    sample, so recording and summarizing stay constant-time regardless
+    of traffic volume.
+    """
+
     def __init__(self):
         self.metrics = {}
-    
+
     def record_metric(self, name: str, value: float, tags: Optional[Dict[str, str]] = None):
         """Record a performance metric."""
-        if name not in self.metrics:
-            self.metrics[name] = []
-        
-        self.metrics[name].append({
-            "value": value,
-            "timestamp": time.time(),
-            "tags": tags or {}
-        })
-        
-        # Keep only last 1000 measurements
-        if len(self.metrics[name]) > 1000:
-            self.metrics[name] = self.metrics[name][-1000:]
-    
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = {
+                "count": 0,
+                "sum": 0.0,
+                "min": float("inf"),
+                "max": float("-inf"),
+                "recent": deque(maxlen=10)
+            }
+
+        metric["count"] += 1
+        metric["sum"] += value
+        if value < metric["min"]:
+            metric["min"] = value
+        if value > metric["max"]:
+            metric["max"] = value
+        metric["recent"].append(value)
+
     def get_metrics(self, name: str) -> Dict[str, Any]:
         """Get metrics summary for a specific metric."""
-        if name not in self.metrics:
+        metric = self.metrics.get(name)
+        if metric is None:
             return {}
-        
-        values = [m["value"] for m in self.metrics[name]]
-        
+
         return {
-            "count": len(values),
-            "min": min(values),
-            "max": max(values),
-            "avg": sum(values) / len(values),
-            "recent": values[-10:] if len(values) >= 10 else values
+            "count": metric["count"],
+            "min": metric["min"],
+            "max": metric["max"],
+            "avg": metric["sum"] / metric["count"],
+            "recent": list(metric["recent"])
         }
-    
+
     def get_all_metrics(self) -> Dict[str, Dict[str, Any]]:
         """Get summary of all metrics."""
         return {name: self.get_metrics(name) for name in self.metrics.keys()}
@@ -54,31 +65,40 @@ class PerformanceMonitor:
 # Global performance monitor instance
 performance_monitor = PerformanceMonitor()
 
+# Monitoring can be disabled entirely (PERF_MON=0/false/off); decorated
+# functions then run with zero instrumentation overhead
+PERF_ENABLED = os.getenv("PERF_MON", "1").lower() not in ("0", "false", "off")
+
 
 def monitor_performance(metric_name: str):
     """Decorator to monitor function execution time."""
     def decorator(func: Callable) -> Callable:
+        if not PERF_ENABLED:
+            return func
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             try:
                 result = func(*args, **kwargs)
                 success = True
-            except Exception as e:
+            except Exception:
                 success = False
                 raise
             finally:
-                execution_time = (time.time() - start_time) * 1000  # Convert to milliseconds
-                
-                performance_monitor.record_metric(
-                    metric_name,
-                    execution_time,
-                    {"success": str(success), "function": func.__name__}
-                )
-                
+                execution_time = (time.perf_counter_ns() - start_ns) / 1e6  # milliseconds
+
+                # Tags are only built on failure or slow calls, keeping the
+                # fast path free of per-call dict allocations
+                tags = None
+                if not success or execution_time > 1000:
+                    tags = {"success": str(success), "function": func.__name__}
+
+                performance_monitor.record_metric(metric_name, execution_time, tags)
+
                 if execution_time > 1000:  # Log slow operations (> 1 second)
                     logger.warning(f"Slow operation detected: {func.__name__} took {execution_time:.2f}ms")
-            
+
             return result
         return wrapper
     return decorator
@@ -87,7 +107,11 @@ def monitor_performance(metric_name: str):
 @contextmanager
 def performance_context(metric_name: str, tags: Optional[Dict[str, str]] = None):
     """Context manager for monitoring code block performance."""
-    start_time = time.time()
+    if not PERF_ENABLED:
+        yield
+        return
+
+    start_ns = time.perf_counter_ns()
     try:
         yield
         success = True
@@ -95,12 +119,14 @@ def performance_context(metric_name: str, tags: Optional[Dict[str, str]] = None)
         success = False
         raise
     finally:
-        execution_time = (time.time() - start_time) * 1000
-        
-        final_tags = {"success": str(success)}
-        if tags:
-            final_tags.update(tags)
-        
+        execution_time = (time.perf_counter_ns() - start_ns) / 1e6
+
+        final_tags = None
+        if not success or tags:
+            final_tags = {"success": str(success)}
+            if tags:
+                final_tags.update(tags)
+
         performance_monitor.record_metric(metric_name, execution_time, final_tags)
 
 
@@ -108,15 +134,17 @@ class DatabaseQueryMonitor:
     """Monitor database query performance."""
     
     def __init__(self):
-        self.slow_queries = []
+        # Bounded deque: appends evict the oldest entry in O(1) instead of
+        # periodically recopying the list
+        self.slow_queries = deque(maxlen=100)
         self.query_count = 0
         self.total_time = 0
-    
+
     def record_query(self, query: str, execution_time: float, result_count: Optional[int] = None):
         """Record database query metrics."""
         self.query_count += 1
         self.total_time += execution_time
-        
+
         # Record slow queries (> 100ms)
         if execution_time > 0.1:
             self.slow_queries.append({
@@ -125,10 +153,6 @@ class DatabaseQueryMonitor:
                 "result_count": result_count,
                 "timestamp": time.time()
             })
-            
-            # Keep only last 100 slow queries
-            if len(self.slow_queries) > 100:
-                self.slow_queries = self.slow_queries[-100:]
     
     def get_stats(self) -> Dict[str, Any]:
         """Get database query statistics."""
@@ -139,7 +163,7 @@ class DatabaseQueryMonitor:
             "total_time": self.total_time,
             "average_time": avg_time,
             "slow_queries_count": len(self.slow_queries),
-            "recent_slow_queries": self.slow_queries[-5:] if self.slow_queries else []
+            "recent_slow_queries": list(self.slow_queries)[-5:] if self.slow_queries else []
         }
 
 